@@ -12,10 +12,13 @@ echo "------------------------------------"
 
 # until ldapwhoami -H ldap://localhost:3389 -x | grep -q "anonymous";
 # until dsctl --json slapd-localhost healthcheck | grep -q "[]";
+# Back off from 1s up to 2s (whole seconds, bash arithmetic): with once.sh pre-run the server is healthy almost at once.
+delay=1
 until /usr/lib/dirsrv/dscontainer -H;
 do
   echo $(date) " Still waiting for dirsrv to start..."
-  sleep 5
+  sleep $delay
+  delay=$(( delay * 2 > 2 ? 2 : delay * 2 ))
 done
 
 # WARNING: healthcheck above returns even if dirsrv isn't quite ready if once.sh wasn't already run
@@ -34,10 +34,13 @@ done
 # - https://github.com/389ds/389-ds-base/pull/6070
 # - https://github.com/389ds/389-ds-base/blob/d65eea90311543b3ea906cdc29ff526ae6b64956/src/lib389/cli/dscontainer#L389
 # - https://github.com/389ds/389-ds-base/blob/d65eea90311543b3ea906cdc29ff526ae6b64956/src/lib389/cli/dscontainer#L402
+# Back off from 1s doubling up to 5s (whole seconds, bash arithmetic): the port is usually up within a second.
+delay=1
 until ldapwhoami -H ldap://localhost:3389 -x | grep -q "anonymous";
 do
   echo $(date) " Still waiting for dirsrv to start (after Healthcheck says healthy)..."
-  sleep 1
+  sleep $delay
+  delay=$(( delay * 2 > 5 ? 5 : delay * 2 ))
 done
 # Now sleep a minimize chance of encountering (but no guarantee) Directory Manager password change after healthy issue
 sleep 10
@@ -2,27 +2,43 @@
 
 Only parameters essential for the sync engine are included.  Anything used
 *solely* during connectivity tests stays in :pyfile:`main.py` for now.
+
+Field defaults are plain values; environment variables are read only when
+:meth:`Config.from_env` is called, never at import time.
 """
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass, field
-from typing import List, Sequence
+import re
+from dataclasses import MISSING, dataclass, field, fields
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Mapping, Sequence
+
+
+# Canonical (lower-case) truthy values; callers normalise case before lookup.
+YES_VALUES: FrozenSet[str] = frozenset({"1", "true", "yes", "on"})
+
+DEFAULT_DISABLED_VALUES: Sequence[str] = ("TRUE", "true", "1", "yes", "YES")
 
+# Entries requested per page of a paged LDAP search.
+DEFAULT_PAGE_SIZE = 500
 
-YES_VALUES: Sequence[str] = ("1", "TRUE", "YES", "ON", "true", "yes", "on")
+# Field names matching this are masked by :meth:`Config.masked_dict`.
+_SECRET_RE = re.compile(r"password|secret|token", re.IGNORECASE)
 
 
-def _env_bool(name: str, default: bool = False) -> bool:
-    val = os.getenv(name)
+def _env_bool(env: Mapping[str, str], name: str, default: bool = False) -> bool:
+    val = env.get(name)
     if val is None:
         return default
-    return val in YES_VALUES
+    return val.strip().lower() in YES_VALUES
 
 
-def _env_list(name: str) -> List[str]:
-    raw = os.getenv(name, "").strip()
-    return [s for s in [p.strip() for p in raw.split(",")] if s]
+def _env_list(env: Mapping[str, str], name: str) -> List[str]:
+    raw = env.get(name)
+    if not raw:
+        return []
+    return [s for p in raw.split(",") if (s := p.strip())]
 
 
 @dataclass(slots=True)
@@ -30,43 +46,103 @@ class Config:
     """Runtime configuration derived from environment variables."""
 
     # LDAP --------------------------------------------------------------
-    ldap_host: str = os.getenv("LDAP_HOST", "ldap://localhost:389")
-    ldap_bind_dn: str = os.getenv("LDAP_BIND_DN", "")
-    ldap_bind_password: str = os.getenv("LDAP_BIND_PASSWORD", "")
-    ldap_base_dn: str = os.getenv("LDAP_BASE_DN", "")
-
-    ldap_object_type: str | None = os.getenv("LDAP_OBJECT_TYPE", None)
-    ldap_user_groups: str | None = os.getenv("LDAP_USER_GROUPS", None)
-    ldap_group_attr: str = os.getenv("LDAP_GROUP_ATTRIBUTE", "memberOf")
-    ldap_filter: str | None = os.getenv("LDAP_FILTER", None)
-    ldap_mail_attr: str = os.getenv("LDAP_MAIL_FIELD", "mail")
-    ldap_disabled_attr: str | None = os.getenv("LDAP_DISABLED_ATTRIBUTE", "nsAccountLock")
-    ldap_disabled_values: List[str] = field(default_factory=lambda: _env_list("LDAP_DISABLED_VALUES") or [
-        "TRUE",
-        "true",
-        "1",
-        "yes",
-        "YES",
-    ])
-    ldap_missing_is_disabled: bool = _env_bool("LDAP_MISSING_IS_DISABLED", False)
-    ldap_users_only: bool = _env_bool("LDAP_USERS_ONLY", False)
-
-    ignore_ldaps_cert: bool = _env_bool("IGNORE_LDAPS_CERT", False)
-    ldap_ca_file: str | None = os.getenv("LDAP_CA_FILE", None)
+    ldap_host: str = "ldap://localhost:389"
+    ldap_bind_dn: str = ""
+    ldap_bind_password: str = ""
+    ldap_base_dn: str = ""
+
+    ldap_object_type: str | None = None
+    ldap_user_groups: str | None = None
+    ldap_group_attr: str = "memberOf"
+    ldap_filter: str | None = None
+    ldap_mail_attr: str = "mail"
+    ldap_disabled_attr: str | None = "nsAccountLock"
+    ldap_disabled_values: List[str] = field(default_factory=lambda: list(DEFAULT_DISABLED_VALUES))
+    ldap_missing_is_disabled: bool = False
+    ldap_users_only: bool = False
+
+    ignore_ldaps_cert: bool = False
+    ldap_ca_file: str | None = None
+    ldap_page_size: int = DEFAULT_PAGE_SIZE  # entries per paged-search round trip
 
     # VaultWarden -------------------------------------------------------
-    vw_url: str = os.getenv("VW_URL", "http://localhost:8080")
-    vw_client_id: str = os.getenv("VW_USER_CLIENT_ID", "")
-    vw_client_secret: str = os.getenv("VW_USER_CLIENT_SECRET", "")
-    vw_org_id: str = os.getenv("VW_ORG_ID", "")
-    ignore_vw_cert: bool = _env_bool("IGNORE_VW_CERT", False)
+    vw_url: str = "http://localhost:8080"
+    vw_client_id: str = ""
+    vw_client_secret: str = ""
+    vw_org_id: str = ""
+    ignore_vw_cert: bool = False
+    max_parallel_ops: int = 8  # concurrent per-user revoke/restore calls
 
     # Misc --------------------------------------------------------------
-    prevent_self_lock: bool = _env_bool("PREVENT_SELF_LOCK", True)
+    prevent_self_lock: bool = True
+    sync_max_skips: int = 0  # idle cycles that may skip the VW fetch in a row (opt-in)
 
-    debug: str = os.getenv("DEBUG", "").upper()
+    debug: bool = False
 
     def __post_init__(self) -> None:
         # strip prefixes from org id if present
-        if self.vw_org_id.startswith("organization."):
-            self.vw_org_id = self.vw_org_id.split(".")[1]
+        self.vw_org_id = self.vw_org_id.removeprefix("organization.")
+
+    def masked_dict(self) -> Dict[str, object]:
+        """Field → value mapping with secrets replaced by ``***`` (for logging).
+
+        Config uses ``__slots__``, so there is no instance dict to hang a
+        cached copy on; callers should only build this when it is logged.
+        """
+        return {f.name: "***" if f.name in _SENSITIVE_FIELDS else getattr(self, f.name) for f in fields(self)}
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] | None = None) -> Config:
+        """Build a :class:`Config` from *env* (defaults to :data:`os.environ`).
+
+        Passing an explicit mapping allows reusing one snapshot of the
+        environment and building configurations in tests without touching
+        the process environment.  Unset variables fall back to the field
+        defaults; plain ``Config()`` never looks at the environment.
+        """
+        e = os.environ if env is None else env
+        d = _FIELD_DEFAULTS
+        return cls(
+            ldap_host=e.get("LDAP_HOST", d["ldap_host"]),
+            ldap_bind_dn=e.get("LDAP_BIND_DN", d["ldap_bind_dn"]),
+            ldap_bind_password=e.get("LDAP_BIND_PASSWORD", d["ldap_bind_password"]),
+            ldap_base_dn=e.get("LDAP_BASE_DN", d["ldap_base_dn"]),
+            ldap_object_type=e.get("LDAP_OBJECT_TYPE", d["ldap_object_type"]),
+            ldap_user_groups=e.get("LDAP_USER_GROUPS", d["ldap_user_groups"]),
+            ldap_group_attr=e.get("LDAP_GROUP_ATTRIBUTE", d["ldap_group_attr"]),
+            ldap_filter=e.get("LDAP_FILTER", d["ldap_filter"]),
+            ldap_mail_attr=e.get("LDAP_MAIL_FIELD", d["ldap_mail_attr"]),
+            ldap_disabled_attr=e.get("LDAP_DISABLED_ATTRIBUTE", d["ldap_disabled_attr"]),
+            ldap_disabled_values=_env_list(e, "LDAP_DISABLED_VALUES") or list(DEFAULT_DISABLED_VALUES),
+            ldap_missing_is_disabled=_env_bool(e, "LDAP_MISSING_IS_DISABLED", d["ldap_missing_is_disabled"]),
+            ldap_users_only=_env_bool(e, "LDAP_USERS_ONLY", d["ldap_users_only"]),
+            ignore_ldaps_cert=_env_bool(e, "IGNORE_LDAPS_CERT", d["ignore_ldaps_cert"]),
+            ldap_ca_file=e.get("LDAP_CA_FILE", d["ldap_ca_file"]),
+            ldap_page_size=max(1, int(e.get("LDAP_PAGE_SIZE", d["ldap_page_size"]))),
+            vw_url=e.get("VW_URL", d["vw_url"]),
+            vw_client_id=e.get("VW_USER_CLIENT_ID", d["vw_client_id"]),
+            vw_client_secret=e.get("VW_USER_CLIENT_SECRET", d["vw_client_secret"]),
+            vw_org_id=e.get("VW_ORG_ID", d["vw_org_id"]),
+            ignore_vw_cert=_env_bool(e, "IGNORE_VW_CERT", d["ignore_vw_cert"]),
+            max_parallel_ops=max(1, int(e.get("MAX_PARALLEL_OPS", d["max_parallel_ops"]))),
+            prevent_self_lock=_env_bool(e, "PREVENT_SELF_LOCK", d["prevent_self_lock"]),
+            sync_max_skips=max(0, int(e.get("SYNC_MAX_SKIPS", d["sync_max_skips"]))),
+            debug=_env_bool(e, "DEBUG", d["debug"]),
+        )
+
+
+# The field defaults double as the fallbacks of :meth:`Config.from_env`, so
+# each default is written once (default_factory fields are handled there).
+_FIELD_DEFAULTS: Dict[str, object] = {f.name: f.default for f in fields(Config) if f.default is not MISSING}
+
+# Field names are fixed, so classify them once at import.
+_SENSITIVE_FIELDS: FrozenSet[str] = frozenset(f.name for f in fields(Config) if _SECRET_RE.search(f.name))
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Return the process-wide :class:`Config`, parsed from the environment once.
+
+    Call ``get_config.cache_clear()`` to force a re-read (e.g. in tests).
+    """
+    return Config.from_env()
@@ -19,10 +19,17 @@ single component exists it is returned as-is.  When *no* component is supplied
 """
 from __future__ import annotations
 
+import re
+from functools import lru_cache
 from typing import Optional
 
 __all__ = ["build_ldap_filter"]
 
+# Group list delimiters: ``;``, ``|`` or a comma *followed by whitespace*.
+_GROUP_SPLIT_RE = re.compile(r"[;|]|,\s+")
+
+_MATCH_ALL = "(objectClass=*)"
+
 
 def _normalize(val: str | None) -> str | None:
     """Return stripped value or ``None`` if empty/None."""
@@ -32,6 +39,7 @@ def _normalize(val: str | None) -> str | None:
     return val or None
 
 
+@lru_cache(maxsize=256)
 def build_ldap_filter(
     object_type: Optional[str] = None,
     groups: Optional[str] = None,
@@ -56,7 +64,20 @@ def build_ldap_filter(
     -------
     str
         RFC-4515 compliant LDAP filter.
+
+    The function is pure, so results are memoised; use
+    ``build_ldap_filter.__wrapped__`` to bypass the cache.
     """
+    # Fast path: only a ready-made, parenthesised filter was supplied.
+    if (
+        (object_type is None or object_type == "*")
+        and not groups
+        and additional_filter
+        and additional_filter[:1] == "("
+        and additional_filter[-1:] == ")"
+    ):
+        return additional_filter
+
     obj = _normalize(object_type)
     if obj == "*":  # explicit wildcard -> ignore
         obj = None
@@ -80,29 +101,25 @@ def build_ldap_filter(
         # Internal commas in a DN are not followed by whitespace, so this
         # heuristic keeps DN integrity for common cases like
         # "cn=user,dc=example,dc=com, cn=other,dc=example,dc=com".
-        import re
-
-        group_list = re.split(r";|\||,\s+", grp)
-        group_list = [g.strip() for g in group_list if g.strip()]
-        if len(group_list) == 1:
-            parts.append(f"({group_attr}={group_list[0]})")
-        elif group_list:
-            or_clause = "".join(f"({group_attr}={g})" for g in group_list)
-            parts.append(f"(|{or_clause})")
+        clauses = [f"({group_attr}={g})" for p in _GROUP_SPLIT_RE.split(grp) if (g := p.strip())]
+        if len(clauses) == 1:
+            parts.append(clauses[0])
+        elif clauses:
+            parts.append("(|" + "".join(clauses) + ")")
 
     # additional user filter (assumed well-formed string)
     if addl:
         # ensure it is wrapped in parentheses
-        if not addl.startswith("("):
-            addl = f"({addl})"
+        if addl[:1] != "(":
+            addl = "(" + addl + ")"
         parts.append(addl)
 
     if not parts:
         # default match all
-        return "(objectClass=*)"
+        return _MATCH_ALL
 
     if len(parts) == 1:
         return parts[0]
 
     # combine with AND
-    return f"(&{''.join(parts)})"
+    return "(&" + "".join(parts) + ")"
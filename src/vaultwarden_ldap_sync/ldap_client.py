@@ -28,27 +28,36 @@ Return value is a list of :class:`LdapUser` dataclass instances.
 from __future__ import annotations
 
 import ssl
+import sys
+from contextlib import suppress
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from typing import List, Sequence
 import logging
 
 from ldap3 import ALL, Connection, Server, Tls
+from ldap3.core.exceptions import LDAPCommunicationError
 
+from .config import DEFAULT_DISABLED_VALUES, DEFAULT_PAGE_SIZE, Config
 # local import without circular dependency
 from .filter_builder import build_ldap_filter
 
 logger = logging.getLogger("vaultwarden_ldap_sync.ldap")
 
-__all__ = ["LdapUser", "fetch_users"]
-
+__all__ = ["LdapClient", "LdapUser", "fetch_users"]
 
 @dataclass(slots=True)
 class LdapUser:
+    """A directory entry; ``email`` is always stored lower-cased and interned."""
+
     dn: str
     email: str | None
     groups: List[str]
     disabled: bool
 
+    def __post_init__(self) -> None:
+        if self.email:
+            self.email = sys.intern(self.email.lower())
+
     def __repr__(self) -> str:  # pragma: no cover – cosmetic
         return (
             "LdapUser(" f"dn={self.dn!r}, email={self.email!r}, groups={len(self.groups)} items, "
@@ -73,9 +82,191 @@ def _build_server(host: str, ignore_cert: bool = False, ca_file: str | None = No
     return Server(clean_host, use_ssl=use_ssl, get_info=None, tls=tls)
 
 
+def _as_str(value: object) -> str:
+    """Attribute value as text; without schema info ldap3 may return bytes."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
 # Public API -----------------------------------------------------------------
 
 
+class LdapClient:
+    """Long-lived LDAP client that keeps one bound connection between fetches.
+
+    The connection is opened lazily by the first :meth:`fetch` and re-opened
+    once if the server dropped it in the meantime (idle timeout, restart…),
+    so a sync loop pays the TCP/TLS handshake and bind only once.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        bind_dn: str,
+        bind_password: str,
+        base_dn: str,
+        object_type: str | None = "person",
+        groups: str | None = None,
+        additional_filter: str | None = None,
+        group_attr: str = "memberOf",
+        email_attr: str = "mail",
+        disabled_attr: str | None = "nsAccountLock",
+        disabled_values: Sequence[str] | None = DEFAULT_DISABLED_VALUES,
+        missing_is_disabled: bool = False,
+        ignore_cert: bool = False,
+        ca_file: str | None = None,
+        timeout: int | float = 5,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        connection: Connection | None = None,
+    ) -> None:
+        self._server = _build_server(host, ignore_cert=ignore_cert, ca_file=ca_file)
+        self._bind_dn = bind_dn
+        self._bind_password = bind_password
+        self._timeout = timeout
+        self._page_size = page_size
+        # A caller-supplied bound connection is used but never unbound here.
+        self._conn: Connection | None = connection
+        self._owns_conn = connection is None
+
+        self._base_dn = base_dn
+        self._group_attr = group_attr
+        self._email_attr = email_attr
+        self._disabled_attr = disabled_attr
+        self._disabled_values = frozenset(disabled_values or ())
+        self._missing_is_disabled = missing_is_disabled
+
+        # Filter and attribute list depend only on configuration – build once.
+        self._filter = build_ldap_filter(object_type, groups, additional_filter, group_attr=group_attr)
+        self._attrs: tuple[str, ...] = (
+            (email_attr, group_attr, disabled_attr) if disabled_attr else (email_attr, group_attr)
+        )
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> LdapClient:
+        """Build a client from the LDAP section of :class:`Config`."""
+        return cls(
+            host=cfg.ldap_host,
+            bind_dn=cfg.ldap_bind_dn,
+            bind_password=cfg.ldap_bind_password,
+            base_dn=cfg.ldap_base_dn,
+            object_type=cfg.ldap_object_type,
+            groups=cfg.ldap_user_groups,
+            additional_filter=cfg.ldap_filter,
+            group_attr=cfg.ldap_group_attr,
+            email_attr=cfg.ldap_mail_attr,
+            disabled_attr=cfg.ldap_disabled_attr,
+            disabled_values=cfg.ldap_disabled_values,
+            missing_is_disabled=cfg.ldap_missing_is_disabled,
+            ignore_cert=cfg.ignore_ldaps_cert,
+            ca_file=cfg.ldap_ca_file,
+            page_size=cfg.ldap_page_size,
+        )
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+    def _connection(self) -> Connection:
+        if self._conn is None or self._conn.closed:
+            self._owns_conn = True
+            self._conn = Connection(
+                self._server,
+                user=self._bind_dn,
+                password=self._bind_password,
+                auto_bind=True,
+                receive_timeout=self._timeout,
+            )
+        return self._conn
+
+    def close(self) -> None:
+        """Unbind and drop the connection; the next fetch reconnects."""
+        conn, self._conn = self._conn, None
+        if conn is not None and self._owns_conn:
+            with suppress(LDAPCommunicationError):
+                conn.unbind()
+
+    def __enter__(self) -> LdapClient:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def fetch(self) -> List[LdapUser]:
+        """Retrieve LDAP users, reconnecting once if the connection went stale."""
+        try:
+            return self._fetch(self._connection())
+        except LDAPCommunicationError as exc:
+            logger.info("LDAP connection lost (%s), reconnecting", exc)
+            self.close()
+            return self._fetch(self._connection())
+
+    def _fetch(self, conn: Connection) -> List[LdapUser]:
+        logger.debug(
+            "Fetching LDAP at %s with filter: %s and attributes: %s", self._base_dn, self._filter, self._attrs
+        )
+
+        users: list[LdapUser] = []
+
+        # Paged search (RFC 2696) keeps memory bounded and avoids server-side
+        # size limits on large directories; entries are yielded page by page.
+        results = conn.extend.standard.paged_search(
+            search_base=self._base_dn,
+            search_filter=self._filter,
+            attributes=self._attrs,
+            paged_size=self._page_size,
+            generator=True,
+        )
+
+        for entry in results:
+            if entry.get("type") != "searchResEntry":  # skip referrals
+                continue
+            attrs = entry["attributes"]
+
+            # DN
+            dn = entry["dn"]
+
+            # email (may be multi-valued – take first); LdapUser normalises case
+            email_val: str | None = None
+            val = attrs.get(self._email_attr)
+            if val:
+                email_val = _as_str(val[0] if isinstance(val, list) else val)
+
+            # groups list
+            groups_val: list[str] = []
+            raw = attrs.get(self._group_attr)
+            if raw:
+                if isinstance(raw, list):
+                    groups_val = [_as_str(g) for g in raw]
+                else:
+                    groups_val = [_as_str(raw)]
+
+            # disabled flag
+            # Determine disabled flag
+            disabled = False
+            attr_present = self._disabled_attr and self._disabled_attr in attrs
+            if attr_present:
+                raw_val = attrs[self._disabled_attr]
+                # Treat empty/None as *missing* for the purpose of missing_is_disabled
+                if raw_val in (None, "", [], ()):  # noqa: RUF100
+                    disabled = self._missing_is_disabled
+                elif isinstance(raw_val, list):
+                    # _as_str(): a caller-supplied connection may carry schema
+                    # info and hand back decoded (bool/int) values.
+                    disabled = not self._disabled_values.isdisjoint(map(_as_str, raw_val))
+                else:
+                    disabled = _as_str(raw_val) in self._disabled_values
+            else:
+                disabled = self._missing_is_disabled
+
+            users.append(LdapUser(dn=dn, email=email_val, groups=groups_val, disabled=disabled))
+
+        return users
+
+
 def fetch_users(
     *,
     host: str,
@@ -88,68 +279,37 @@ def fetch_users(
     group_attr: str = "memberOf",
     email_attr: str = "mail",
     disabled_attr: str | None = "nsAccountLock",
-    disabled_values: Sequence[str] | None = ("TRUE", "true", "1", "yes", "YES"),
+    disabled_values: Sequence[str] | None = DEFAULT_DISABLED_VALUES,
     missing_is_disabled: bool = False,
     ignore_cert: bool = False,
     ca_file: str | None = None,
     timeout: int | float = 5,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    connection: Connection | None = None,
 ) -> List[LdapUser]:
-    """Retrieve LDAP users.
+    """Retrieve LDAP users over a one-off connection.
 
     Parameters are mostly self-explanatory mirrors of environment variables.
+    An already bound *connection* is reused (and left bound) instead of
+    opening one.  Long-running callers should keep an :class:`LdapClient`.
     """
-    server = _build_server(host, ignore_cert=ignore_cert, ca_file=ca_file)
-    conn = Connection(server, user=bind_dn, password=bind_password, auto_bind=True, receive_timeout=timeout)
-
-    search_filter = build_ldap_filter(object_type, groups, additional_filter, group_attr=group_attr)
-
-    attributes = [email_attr, group_attr]
-    if disabled_attr:
-        attributes.append(disabled_attr)
-
-    logger.debug(f"Fetching LDAP at {base_dn} with filter: {search_filter} and attributes: {attributes}")
-
-    conn.search(search_base=base_dn, search_filter=search_filter, attributes=attributes)
-
-    users: list[LdapUser] = []
-    dl_vals = set(disabled_values or ())
-
-    for entry in conn.entries:
-        # DN
-        dn = str(entry.entry_dn)
-
-        # email (may be multi-valued – take first)
-        email_val: str | None = None
-        if email_attr in entry and entry[email_attr].value:
-            val = entry[email_attr].value
-            email_val = val[0] if isinstance(val, Iterable) and not isinstance(val, str) else str(val)
-
-        # groups list
-        groups_val: list[str] = []
-        if group_attr in entry and entry[group_attr].value:
-            raw = entry[group_attr].value
-            if isinstance(raw, list):
-                groups_val = [str(g) for g in raw]
-            else:
-                groups_val = [str(raw)]
-
-        # disabled flag
-        # Determine disabled flag
-        disabled = False
-        attr_present = disabled_attr and disabled_attr in entry
-        if attr_present:
-            raw_val = entry[disabled_attr].value
-            # Treat empty/None as *missing* for the purpose of missing_is_disabled
-            if raw_val in (None, "", [], ()):  # noqa: RUF100
-                disabled = missing_is_disabled
-            elif isinstance(raw_val, list):
-                disabled = any(str(v) in dl_vals for v in raw_val)
-            else:
-                disabled = str(raw_val) in dl_vals
-        else:
-            disabled = missing_is_disabled
-
-        users.append(LdapUser(dn=dn, email=email_val, groups=groups_val, disabled=disabled))
-
-    conn.unbind()
-    return users
+    with LdapClient(
+        host=host,
+        bind_dn=bind_dn,
+        bind_password=bind_password,
+        base_dn=base_dn,
+        object_type=object_type,
+        groups=groups,
+        additional_filter=additional_filter,
+        group_attr=group_attr,
+        email_attr=email_attr,
+        disabled_attr=disabled_attr,
+        disabled_values=disabled_values,
+        missing_is_disabled=missing_is_disabled,
+        ignore_cert=ignore_cert,
+        ca_file=ca_file,
+        timeout=timeout,
+        page_size=page_size,
+        connection=connection,
+    ) as client:
+        return client.fetch()
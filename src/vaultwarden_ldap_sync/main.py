@@ -5,18 +5,18 @@ Further logic will be introduced in subsequent steps.
 """
 import os
 import logging
+import signal
 import sys
-import time
+import threading
 
-from vaultwarden_ldap_sync.config import Config
-from vaultwarden_ldap_sync.sync_engine import run_sync
+from vaultwarden_ldap_sync.config import YES_VALUES, Config, get_config
+from vaultwarden_ldap_sync.ldap_client import LdapClient
+from vaultwarden_ldap_sync.sync_engine import SyncState, run_sync
+from vaultwarden_ldap_sync.vw_client import VaultWardenClient
 
 import gc
 from collections import Counter
 
-# Truthy values helper
-YES_VALUES = ("1", "TRUE", "YES", "ON", "true", "yes", "on")
-
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
@@ -24,7 +24,7 @@ YES_VALUES = ("1", "TRUE", "YES", "ON", "true", "yes", "on")
 def _setup_logging() -> logging.Logger:
     """Configure and return the application logger."""
 
-    debug = os.getenv("DEBUG", "").upper() in YES_VALUES
+    debug = get_config().debug
 
     # Configure only the application logger, not the root logger
     app_logger = logging.getLogger("vaultwarden_ldap_sync")
@@ -60,9 +60,11 @@ class ObjectTracker:
         self.previous_counts = Counter()
     
     def track_growth(self):
+        # Walking the whole heap is expensive – only do it when the result is logged
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         objectcount = gc.get_objects()
-        current_counts = Counter(type(obj).__name__ for obj in objectcount)
-        objects_of_type = [obj for obj in objectcount if type(obj).__name__ == "list"]
+        current_counts = Counter(map(type, objectcount))
         
         if self.previous_counts:
             growth = {
@@ -72,43 +74,78 @@ class ObjectTracker:
             }
             
             # Show objects that grew by more than 100
-            significant_growth = {k: v for k, v in growth.items() if v > 100}
+            significant_growth = {k.__name__: v for k, v in growth.items() if v > 100}
             if significant_growth:
-                logger.debug(f"Object count: {len(objectcount)}, object growth: {significant_growth}")
+                logger.debug("Object count: %s, object growth: %s", len(objectcount), significant_growth)
         
         self.previous_counts = current_counts
 
 tracker = ObjectTracker()
 
+# ---------------------------------------------------------------------------
+# Shutdown handling
+# ---------------------------------------------------------------------------
+
+_stop_event = threading.Event()
+
+
+def shutdown(signum: int | None = None, frame=None) -> None:  # noqa: ARG001 – signal handler signature
+    """Request the sync loop to stop; safe to call from a signal handler."""
+    if signum is not None:
+        logger.info("Received signal %s, stopping after current cycle", signum)
+    _stop_event.set()
+
 # ---------------------------------------------------------------------------
 # Main entrypoint
 # ---------------------------------------------------------------------------
 
 def main() -> None:
     """Run the VaultWarden-LDAP sync engine once or in a loop."""
-    cfg = Config()
+    cfg = get_config()
     interval = int(os.getenv("SYNC_INTERVAL", "60"))
     max_failures = int(os.getenv("MAX_CONSECUTIVE_FAILURES", "5"))
-    run_once = os.getenv("RUN_ONCE", "0").strip().upper() in YES_VALUES
+    run_once = os.getenv("RUN_ONCE", "0").strip().lower() in YES_VALUES
 
     logger.info("Starting sync (interval=%ss, run_once=%s, max_failures=%s)", interval, run_once, max_failures)
 
-    failures = 0
+    signal.signal(signal.SIGTERM, shutdown)
 
-    while True:
-        try:
-            tracker.track_growth()
-            run_sync(cfg)
-            failures = 0  # reset on success
-        except Exception:  # noqa: BLE001
-            failures += 1
-            logger.exception("Sync cycle failed (consecutive failures: %s)", failures)
-            if failures >= max_failures:
-                logger.critical("Exceeded MAX_CONSECUTIVE_FAILURES (%s), exiting", max_failures)
-                sys.exit(1)
-        if run_once:
-            break
-        time.sleep(interval)
+    failures = 0
+    # One LDAP connection for the lifetime of the process instead of a
+    # connect/bind/unbind per cycle.
+    ldap = LdapClient.from_config(cfg)
+    state = SyncState(max_skips=cfg.sync_max_skips)
+    # Likewise one VW client (OAuth token + HTTP keep-alive pool), created on
+    # first use so a VW outage at start-up counts as a failed cycle.
+    vw: VaultWardenClient | None = None
+
+    def vw_factory(c: Config) -> VaultWardenClient:
+        nonlocal vw
+        if vw is None:
+            vw = VaultWardenClient.from_config(c)
+        return vw
+
+    with ldap:
+        while not _stop_event.is_set():
+            try:
+                tracker.track_growth()
+                run_sync(cfg, fetcher=lambda _cfg: ldap.fetch(), vw_factory=vw_factory, state=state)
+                failures = 0  # reset on success
+            except Exception:  # noqa: BLE001
+                failures += 1
+                logger.exception("Sync cycle failed (consecutive failures: %s)", failures)
+                if vw is not None:
+                    # Start the next attempt from a fresh VW session.
+                    vw.close()
+                    vw = None
+                if failures >= max_failures:
+                    logger.critical("Exceeded MAX_CONSECUTIVE_FAILURES (%s), exiting", max_failures)
+                    sys.exit(1)
+            if run_once or _stop_event.wait(interval):
+                break
+
+    if vw is not None:
+        vw.close()
 
     logger.info("Sync finished, exiting")
 
@@ -6,33 +6,68 @@ is easy to unit-test by providing stubbed fetchers / clients.
 from __future__ import annotations
 
 import logging
-from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Set
+from functools import partial
+from typing import AbstractSet, Callable, Dict, FrozenSet, List, Set, Tuple
+from uuid import UUID
 
 from .config import Config
-from .ldap_client import LdapUser, fetch_users
+from .ldap_client import LdapClient, LdapUser
 from .vw_client import OrgUser, VaultWardenClient
 
 logger = logging.getLogger("vaultwarden_ldap_sync.engine")
 
+_OP_VERBS = {"invite": "Inviting", "revoke": "Revoking", "restore": "Restoring"}
+
 # ---------------------------------------------------------------------------
 # Dataclasses for result reporting
 # ---------------------------------------------------------------------------
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class SyncActions:
-    """Calculated actions for a reconciliation cycle."""
+    """Calculated actions for a reconciliation cycle (read-only once planned)."""
 
-    invite: Set[str] = field(default_factory=set)
-    revoke: Set[str] = field(default_factory=set)
-    restore: Set[str] = field(default_factory=set)
+    invite: AbstractSet[str] = field(default_factory=frozenset)
+    revoke: AbstractSet[str] = field(default_factory=frozenset)
+    restore: AbstractSet[str] = field(default_factory=frozenset)
 
     def any(self) -> bool:
         return bool(self.invite or self.revoke or self.restore)
 
 
+@dataclass(slots=True)
+class SyncState:
+    """Memory carried between :func:`run_sync` calls of a long-running loop.
+
+    If LDAP returns exactly what it returned on the previous cycle and that
+    cycle needed no actions, the VW membership fetch is skipped.  Changes made
+    directly in VaultWarden are only corrected once a full comparison runs,
+    i.e. after up to *max_skips* skipped cycles; the default ``0`` compares
+    every cycle.
+    """
+
+    max_skips: int = 0
+    _snapshot: FrozenSet[Tuple[str | None, bool]] | None = field(default=None, init=False, repr=False)
+    _skipped: int = field(default=0, init=False, repr=False)
+
+    @property
+    def may_skip(self) -> bool:
+        """Whether the next cycle could be skipped, depending on LDAP."""
+        return self._snapshot is not None and self._skipped < self.max_skips
+
+    def should_skip(self, snapshot: FrozenSet[Tuple[str | None, bool]]) -> bool:
+        if self.may_skip and snapshot == self._snapshot:
+            self._skipped += 1
+            return True
+        return False
+
+    def record(self, snapshot: FrozenSet[Tuple[str | None, bool]], idle: bool) -> None:
+        self._snapshot = snapshot if idle else None
+        self._skipped = 0
+
+
 # ---------------------------------------------------------------------------
 # Core algorithm
 # ---------------------------------------------------------------------------
@@ -42,34 +77,74 @@ def _calculate_actions(
     *,
     ldap_users: List[LdapUser],
     vw_users: Dict[str, OrgUser],
-    whitelist: Set[str],
+    whitelist: FrozenSet[str],
     ldap_users_only: bool,
 ) -> SyncActions:
     """Return which e-mail addresses need to be invited/revoked/restored."""
 
-    ldap_enabled = {u.email.lower() for u in ldap_users if u.email and not u.disabled}
-    ldap_disabled = {u.email.lower() for u in ldap_users if u.email and u.disabled}
-
-    vw_active = {e for e, u in vw_users.items() if u.active}
-    vw_revoked = {e for e, u in vw_users.items() if u.revoked}
-
-    actions = SyncActions()
-
-    # invites: enabled in LDAP but no presence in VW at all
-    actions.invite = ldap_enabled - vw_active - vw_revoked - whitelist
-
-    # revoke: disabled in LDAP but currently active in VW
-    actions.revoke = (ldap_disabled & vw_active) - whitelist
-
-    # restore: enabled in LDAP but currently *revoked* in VW
-    actions.restore = ldap_enabled & vw_revoked
-
-    if ldap_users_only:
-        # revoke everyone active but not in ldap_enabled, taking whitelist into account
-        extra = (vw_active - ldap_enabled) - whitelist
-        actions.revoke |= extra
-
-    return actions
+    # LdapUser.email is lower-cased at ingestion, as are the user_map() keys.
+    ldap_enabled: Set[str] = set()
+    ldap_disabled: Set[str] = set()
+    for u in ldap_users:
+        if u.email:
+            (ldap_disabled if u.disabled else ldap_enabled).add(u.email)
+
+    # One pass over VW, classifying each member against the LDAP buckets.
+    revoke: Set[str] = set()
+    restore: Set[str] = set()
+    for e, u in vw_users.items():
+        if u.active:
+            # revoke: disabled in LDAP (or, with ldap_users_only, not enabled
+            # in LDAP) but currently active in VW – never the whitelist
+            if e not in whitelist and (e in ldap_disabled or (ldap_users_only and e not in ldap_enabled)):
+                revoke.add(e)
+        elif u.revoked:
+            # restore: enabled in LDAP but currently *revoked* in VW
+            if e in ldap_enabled:
+                restore.add(e)
+
+    # invites: enabled in LDAP but no presence in VW at all (any status)
+    invite = ldap_enabled.difference(vw_users.keys(), whitelist)
+
+    return SyncActions(invite=frozenset(invite), revoke=frozenset(revoke), restore=frozenset(restore))
+
+
+def _perform(op: str, email: str, call: Callable[[], None]) -> str | None:
+    """Run one VW action, returning an error description instead of raising."""
+    logger.info("%s user %s", _OP_VERBS[op], email)
+    try:
+        call()
+    except Exception as exc:  # noqa: BLE001
+        logger.error("Failed to %s %s: %s", op, email, exc)
+        return f"{op} {email}: {exc}"
+    return None
+
+
+def _perform_bulk(
+    op: str,
+    emails: AbstractSet[str],
+    call: Callable[[List], Dict | None],
+    id_by_email: Dict[str, UUID] | None = None,
+) -> List[str]:
+    """Run one bulk VW action, returning an error description per failed user.
+
+    *call* receives the org-user ids from *id_by_email*, or the e-mails
+    themselves without it, and may return an error message per id.
+    """
+    keys = {email: id_by_email[email] if id_by_email is not None else email for email in emails}
+    for email in keys:
+        logger.info("%s user %s", _OP_VERBS[op], email)
+    try:
+        failed = call(list(keys.values())) or {}
+    except Exception as exc:  # noqa: BLE001
+        logger.error("Failed to %s %d users: %s", op, len(keys), exc)
+        return [f"{op} {email}: {exc}" for email in keys]
+    errors = []
+    for email, key in keys.items():
+        if (err := failed.get(key)):
+            logger.error("Failed to %s %s: %s", op, email, err)
+            errors.append(f"{op} {email}: {err}")
+    return errors
 
 
 # ---------------------------------------------------------------------------
@@ -82,60 +157,84 @@ def run_sync(
     *,
     fetcher: Callable[[Config], List[LdapUser]] | None = None,
     vw_factory: Callable[[Config], VaultWardenClient] | None = None,
+    state: SyncState | None = None,
 ) -> SyncActions:
     """Execute a full reconciliation cycle and perform required VW actions.
 
     The *fetcher* and *vw_factory* are injectable for unit-tests; if ``None``
-    the real implementations are used.
+    the real implementations are used.  Passing the same *state* on every
+    call lets idle cycles skip the VW fetch (see :class:`SyncState`).
     """
+    if vw_factory is None:
+        # A client built here lives for this call only – close its HTTP pool.
+        created: List[VaultWardenClient] = []
+
+        def _own_factory(c: Config) -> VaultWardenClient:
+            created.append(VaultWardenClient.from_config(c))
+            return created[-1]
+
+        try:
+            return run_sync(cfg, fetcher=fetcher, vw_factory=_own_factory, state=state)
+        finally:
+            for client in created:
+                client.close()
+
     # --------------------------------------------------------------
     # Log configuration, masking sensitive values
     # --------------------------------------------------------------
-    cfg_dict = asdict(cfg)
-    for k in cfg_dict:
-        if any(s in k.lower() for s in ("password", "secret", "token")):
-            cfg_dict[k] = "***"
-    logger.debug("Starting sync run with config: %s", cfg_dict)
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Starting sync run with config: %s", cfg.masked_dict())
 
     # ------------------------------------------------------------------
     # 1. Gather state
     # ------------------------------------------------------------------
-    ldap_fetch = fetcher or (
-        lambda c: fetch_users(
-            host=c.ldap_host,
-            bind_dn=c.ldap_bind_dn,
-            bind_password=c.ldap_bind_password,
-            base_dn=c.ldap_base_dn,
-            object_type=c.ldap_object_type,
-            groups=c.ldap_user_groups,
-            additional_filter=c.ldap_filter,
-            group_attr=c.ldap_group_attr,
-            email_attr=c.ldap_mail_attr,
-            disabled_attr=c.ldap_disabled_attr,
-            disabled_values=c.ldap_disabled_values,
-            missing_is_disabled=c.ldap_missing_is_disabled,
-            ignore_cert=c.ignore_ldaps_cert,
-            ca_file=c.ldap_ca_file,
-        )
-    )
+    def _default_fetch(c: Config) -> List[LdapUser]:
+        with LdapClient.from_config(c) as client:
+            return client.fetch()
+
+    ldap_fetch = fetcher or _default_fetch
+
+    def _vw_fetch() -> Tuple[VaultWardenClient, Dict[str, OrgUser]]:
+        client = vw_factory(cfg)
+        # The factory may hand out a client reused across cycles – always
+        # re-read membership instead of trusting its cached user list.
+        return client, client.user_map(force=True)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # The LDAP and VW reads are independent, so overlap the two round-trips
+        # – unless the LDAP result may make the VW fetch unnecessary.
+        serial = state is not None and state.may_skip
+        vw_future = None if serial else pool.submit(_vw_fetch)
+
+        ldap_users = ldap_fetch(cfg)
+        snapshot = frozenset((u.email, u.disabled) for u in ldap_users)
+        if serial and state.should_skip(snapshot):
+            logger.debug("LDAP unchanged since last idle cycle, skipping VW fetch")
+            return SyncActions()
+
+        if not ldap_users and not cfg.ldap_users_only:
+            # Nothing can be invited, revoked or restored – most likely a
+            # base DN / filter problem rather than an empty directory.
+            logger.warning("LDAP search returned no users, nothing to reconcile")
+            if vw_future is not None:
+                # Surface a VW outage instead of reporting an idle cycle.
+                vw_future.result()
+            if state is not None:
+                state.record(snapshot, idle=True)
+            return SyncActions()
+
+        vw_client, vw_users_map = (vw_future or pool.submit(_vw_fetch)).result()
 
-    ldap_users = ldap_fetch(cfg)
     logger.debug("Fetched %d LDAP entries", len(ldap_users))
-    for u in ldap_users:
-        logger.debug("LDAP: %s – %s – %s", getattr(u, 'dn', 'no-dn'), u.email, "disabled" if u.disabled else "enabled")
-
-    vw_client = vw_factory(cfg) if vw_factory else VaultWardenClient(
-        url=cfg.vw_url,
-        client_id=cfg.vw_client_id,
-        client_secret=cfg.vw_client_secret,
-        org_id=cfg.vw_org_id,
-        ignore_cert=cfg.ignore_vw_cert,
-    )
+    if debug:
+        for u in ldap_users:
+            logger.debug("LDAP: %s – %s – %s", getattr(u, 'dn', 'no-dn'), u.email, "disabled" if u.disabled else "enabled")
 
-    vw_users_map = vw_client.user_map()
     logger.debug("Fetched %d VW org users", len(vw_users_map))
-    for email, user in vw_users_map.items():
-        logger.debug("VW: %s – %s", email, "revoked" if user.revoked else ("active" if user.active else "inactive"))
+    if debug:
+        for email, user in vw_users_map.items():
+            logger.debug("VW: %s – %s", email, "revoked" if user.revoked else ("active" if user.active else "inactive"))
 
     # ------------------------------------------------------------------
     # 2. Calculate actions
@@ -148,7 +247,7 @@ def run_sync(
             own_email = own_email.lower()
             logger.debug("Whitelisting self e-mail %s to avoid self-lock", own_email)
 
-    whitelist = {own_email} if own_email else set()
+    whitelist = frozenset((own_email,)) if own_email else frozenset()
 
     actions = _calculate_actions(
         ldap_users=ldap_users,
@@ -159,33 +258,41 @@ def run_sync(
 
     logger.debug("Action plan – invite: %s, revoke: %s, restore: %s", actions.invite, actions.revoke, actions.restore)
 
+    if state is not None:
+        state.record(snapshot, idle=not actions.any())
+
+    if not actions.any():
+        logger.debug("No actions to perform")
+        return actions
+
+    # Only the org-user ids of revoke/restore targets are needed from here on.
+    id_by_email = {e: vw_users_map[e].id for e in actions.revoke | actions.restore}
+
     # ------------------------------------------------------------------
     # 3. Perform actions (INFO level)
     # ------------------------------------------------------------------
+    # Invites go out as one request. Revokes and restores do too where the
+    # server supports it; otherwise they are independent per-user round-trips
+    # on distinct org users and run concurrently. Set order is fine here –
+    # nothing depends on processing users alphabetically.
     errors: List[str] = []
-    for email in sorted(actions.invite):
-        logger.info("Inviting user %s", email)
-        try:
-            vw_client.invite(email)
-        except Exception as exc:  # noqa: BLE001
-            logger.error("Failed to invite %s: %s", email, exc)
-            errors.append(f"invite {email}: {exc}")
-
-    for email in sorted(actions.revoke):
-        logger.info("Revoking user %s", email)
-        try:
-            vw_client.revoke(vw_users_map[email].id)
-        except Exception as exc:  # noqa: BLE001
-            logger.error("Failed to revoke %s: %s", email, exc)
-            errors.append(f"revoke {email}: {exc}")
-
-    for email in sorted(actions.restore):
-        logger.info("Restoring user %s", email)
-        try:
-            vw_client.restore(vw_users_map[email].id)
-        except Exception as exc:  # noqa: BLE001
-            logger.error("Failed to restore %s: %s", email, exc)
-            errors.append(f"restore {email}: {exc}")
+    if actions.invite:
+        errors += _perform_bulk("invite", actions.invite, vw_client.invite_many)
+    jobs = []
+    bulk = (actions.revoke or actions.restore) and vw_client.supports_bulk()
+    for op, emails, single, many in (
+        ("revoke", actions.revoke, vw_client.revoke, vw_client.revoke_many),
+        ("restore", actions.restore, vw_client.restore, vw_client.restore_many),
+    ):
+        if not emails:
+            continue
+        if bulk:
+            errors += _perform_bulk(op, emails, many, id_by_email)
+        else:
+            jobs += [(op, email, partial(single, id_by_email[email])) for email in emails]
+    if jobs:
+        with ThreadPoolExecutor(max_workers=cfg.max_parallel_ops) as pool:
+            errors += [err for err in pool.map(lambda job: _perform(*job), jobs) if err]
 
     if errors:
         logger.warning("Errors encountered during sync: %s", "; ".join(errors))
@@ -14,27 +14,69 @@ user‐client UUID so the PREVENT_SELF_LOCK logic can mark it safe.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 import httpx
-from typing import Dict, List
+from typing import Dict, Iterator, List, Sequence
 from uuid import UUID
-import asyncio
+import json
 import logging
+import sys
+import threading
+import time
 
 from vaultwarden.clients.bitwarden import BitwardenAPIClient as _BWClient
 from vaultwarden.models.bitwarden import Organization, get_organization
+from vaultwarden.models.enum import OrganizationUserType
+
+from .config import Config
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Seconds before expiry at which a cached access token is renewed.
+_TOKEN_REFRESH_MARGIN = 60
+
+# python-vaultwarden user fields, in OrgUser field order.
+_ORG_USER_FIELDS = attrgetter("Id", "Email", "Status")
+
+# POST endpoint taking a list of e-mails to invite.
+_INVITE_PATH = "/api/organizations/{org}/users/invite"
+
+# PUT endpoints for per-user and bulk revoke / restore.
+_USER_ACTION_PATH = "/api/organizations/{org}/users/{uid}/{action}"
+_BULK_ACTION_PATH = "/api/organizations/{org}/users/{action}"
+
+# Set while the current thread probes the bulk endpoints (see supports_bulk).
+_probe = threading.local()
+
+
+def _drop_probe_miss(record: logging.LogRecord) -> bool:
+    """Filter python-vaultwarden's ERROR for the probe's expected 404 / 405.
+
+    Thread-local, so errors logged by other threads meanwhile still show.
+    """
+    return not (getattr(_probe, "active", False) and record.getMessage() in ("Error: 404", "Error: 405"))
+
+
+logging.getLogger("vaultwarden.utils.logger").addFilter(_drop_probe_miss)
+
 
 @dataclass(slots=True)
 class OrgUser:
-    """Simplified representation of an organisation user."""
+    """Simplified representation of an organisation user.
+
+    ``email`` is lower-cased and interned on construction so it compares
+    cheaply against :class:`~vaultwarden_ldap_sync.ldap_client.LdapUser` e-mails.
+    """
 
     id: UUID  # organisation *user* id (not account id)
     email: str
     status: int  # 0 = active, -1 = revoked, 2 = owner, etc.
 
+    def __post_init__(self) -> None:
+        self.email = sys.intern(self.email.lower())
+
     @property
     def revoked(self) -> bool:
         return self.status == -1
@@ -47,6 +89,8 @@ class OrgUser:
 class VaultWardenClient:
     """Facade around *python-vaultwarden* for the sync engine."""
 
+    __slots__ = ("_bw", "_org", "_userid_to_email", "_users_stale", "_bulk_supported", "_token_lock")
+
     def __init__(
         self,
         *,
@@ -57,12 +101,6 @@ class VaultWardenClient:
         ignore_cert: bool = False,
     ) -> None:
         # BitwardenAPIClient still demands email / password – provide dummies
-        # When TLS verification is disabled we monkey-patch httpx so every request
-        # defaults to verify=False.  This works regardless of *python-vaultwarden*
-        # internals and avoids passing unsupported kwargs.
-        if ignore_cert:
-            _patch_httpx_no_verify()
-
         bw_kwargs = dict(
             url=url,
             email="dummy@example.invalid",
@@ -72,20 +110,75 @@ class VaultWardenClient:
             device_id="vaultwarden-ldap-sync",
         )
         self._bw = _BWClient(**bw_kwargs)
+        if ignore_cert:
+            self._bw._http_client = _unverified_copy(self._bw._http_client)
 
         self._org: Organization = get_organization(self._bw, org_id)
+        self._userid_to_email: Dict[UUID, str] | None = None
+        self._users_stale = False
+        # Whether the server has the bulk revoke / restore endpoints; probed lazily
+        self._bulk_supported: bool | None = None
+        # Per-user revoke/restore calls run on several threads; renew the
+        # token in one of them only.
+        self._token_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> VaultWardenClient:
+        """Build a client from the VaultWarden section of :class:`Config`."""
+        return cls(
+            url=cfg.vw_url,
+            client_id=cfg.vw_client_id,
+            client_secret=cfg.vw_client_secret,
+            org_id=cfg.vw_org_id,
+            ignore_cert=cfg.ignore_vw_cert,
+        )
+
+    def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        self._bw._http_client.close()
+
+    def __enter__(self) -> VaultWardenClient:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _ensure_token(self) -> None:
+        # python-vaultwarden refreshes only once the token has expired, without
+        # any locking; renew a little early, before every request, so a long
+        # batch never hits that unguarded path from the worker threads.  The
+        # first login happens in the (serial) member fetch.
+        with self._token_lock:
+            token = self._bw.connect_token
+            if token is not None and token.is_expired(now=time.time() + _TOKEN_REFRESH_MARGIN):
+                self._bw._refresh_connect_token()
 
     # ---------------------------------------------------------------------
     # Helpers
     # ---------------------------------------------------------------------
+    def _iter_users(self, force: bool = False) -> Iterator[OrgUser]:
+        force = force or self._users_stale
+        self._users_stale = False
+        if force:
+            self._ensure_token()
+        users = self._org.users(force_refresh=force)
+        # Derive our_email()'s view from the same snapshot while we have it.
+        self._userid_to_email = _userid_map(users)
+        for u in users:
+            yield OrgUser(*_ORG_USER_FIELDS(u))
+
     def list_users(self, force: bool = False) -> List[OrgUser]:
         """Return *all* users in the organisation as :class:`OrgUser`."""
-        users = self._org.users(force_refresh=force)
-        return [OrgUser(id=u.Id, email=u.Email, status=u.Status) for u in users]
+        return list(self._iter_users(force))
 
     def user_map(self, force: bool = False) -> Dict[str, OrgUser]:
         """Mapping *email → OrgUser* for quick lookups."""
-        return {u.email.lower(): u for u in self.list_users(force)}
+        return {u.email: u for u in self._iter_users(force)}
+
+    def invalidate_users(self) -> None:
+        """Drop cached membership so the next lookup re-reads it from VW."""
+        self._userid_to_email = None
+        self._users_stale = True
 
     def our_email(self, user_uuid: str | None = None) -> str | None:
         """Best-effort detection of the service-account e-mail.
@@ -94,135 +187,172 @@ class VaultWardenClient:
         UUID portion of the *user.* client id.  Returns the e-mail address or
         ``None`` if not found.
         """
-        if not user_uuid:
-            return None
-        try:
-            uuid_obj = UUID(user_uuid)
-        except ValueError:
+        uuid_obj = _parse_uuid(user_uuid) if user_uuid else None
+        if uuid_obj is None:
             return None
-        for user in self._org.users():  # list_users gives org-user not account
-            if getattr(user, "UserId", None) == uuid_obj:
-                return user.Email
-        return None
+        if self._userid_to_email is None:
+            self._userid_to_email = _userid_map(self._org.users())
+        return self._userid_to_email.get(uuid_obj)
 
     # ------------------------------------------------------------------
     # Mutating operations – info logging should be done by caller
     # ------------------------------------------------------------------
     def invite(self, email: str) -> None:
+        self.invite_many([email])
+
+    def invite_many(self, emails: Sequence[str]) -> None:
+        """Invite several users in one request (plain members, no collections).
+
+        Posted directly rather than through ``Organization.invite``, which
+        takes one address and re-reads the whole member list after every call.
+        """
+        self._ensure_token()
         try:
-            self._org.invite(
-                email=email,
-                collections=[],
-                default_readonly=True,
-                default_hide_passwords=True,
+            self._bw.api_request(
+                method="POST",
+                path=_INVITE_PATH.format(org=self._org.Id),
+                json={
+                    "emails": list(emails),
+                    "type": OrganizationUserType.User,
+                    "collections": [],
+                    "groups": [],
+                    "permissions": {},
+                },
             )
         except Exception as exc:
             # Try to extract HTTP response details if available
             response_details = self._extract_http_error(exc)
-            raise Exception(f'Failed to invite {email}: {exc}{response_details}') from exc
+            target = emails[0] if len(emails) == 1 else f"{len(emails)} users"
+            raise Exception(f'Failed to invite {target}: {exc}{response_details}') from exc
+        finally:
+            self.invalidate_users()
 
     def revoke(self, org_user_id: UUID) -> None:
+        self._user_action(org_user_id, "revoke")
+
+    def restore(self, org_user_id: UUID) -> None:
+        self._user_action(org_user_id, "restore")
+
+    def _user_action(self, org_user_id: UUID, action: str) -> None:
+        self._ensure_token()
         try:
             self._bw.api_request(
                 method="PUT",
-                path=f"/api/organizations/{self._org.Id}/users/{org_user_id}/revoke",
+                path=_USER_ACTION_PATH.format(org=self._org.Id, uid=org_user_id, action=action),
             )
         except Exception as exc:
             # Try to extract HTTP response details if available
             response_details = self._extract_http_error(exc)
-            raise Exception(f'Failed to revoke user {org_user_id}: {exc}{response_details}') from exc
-
-    def restore(self, org_user_id: UUID) -> None:
+            raise Exception(f'Failed to {action} user {org_user_id}: {exc}{response_details}') from exc
+        finally:
+            self.invalidate_users()
+
+    def supports_bulk(self) -> bool:
+        """Whether :meth:`revoke_many` / :meth:`restore_many` can be used.
+
+        Probed once per client with an empty bulk revoke; servers without the
+        endpoint answer 404 / 405.  Vaultwarden added the bulk revoke and
+        restore endpoints in the same release, so the revoke probe stands for
+        both.  Any other failure also means "no" for now, but is probed again
+        on the next call.  Never raises.
+        """
+        if self._bulk_supported is None:
+            _probe.active = True
+            try:
+                self._ensure_token()
+                self._bw.api_request(
+                    method="PUT",
+                    path=_BULK_ACTION_PATH.format(org=self._org.Id, action="revoke"),
+                    json={"ids": []},
+                )
+            except httpx.HTTPStatusError as exc:
+                logger.debug("Bulk user endpoints unavailable (HTTP %s)", exc.response.status_code)
+                if exc.response.status_code in (404, 405):
+                    self._bulk_supported = False
+                return False
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("Bulk user endpoint probe failed: %s", exc)
+                return False
+            finally:
+                _probe.active = False
+            self._bulk_supported = True
+        return self._bulk_supported
+
+    def revoke_many(self, org_user_ids: Sequence[UUID]) -> Dict[UUID, str]:
+        """Revoke several users in one request; returns errors by org-user id."""
+        return self._bulk_user_action(org_user_ids, "revoke")
+
+    def restore_many(self, org_user_ids: Sequence[UUID]) -> Dict[UUID, str]:
+        """Restore several users in one request; returns errors by org-user id."""
+        return self._bulk_user_action(org_user_ids, "restore")
+
+    def _bulk_user_action(self, org_user_ids: Sequence[UUID], action: str) -> Dict[UUID, str]:
+        self._ensure_token()
         try:
-            self._bw.api_request(
+            resp = self._bw.api_request(
                 method="PUT",
-                path=f"/api/organizations/{self._org.Id}/users/{org_user_id}/restore",
+                path=_BULK_ACTION_PATH.format(org=self._org.Id, action=action),
+                json={"ids": [str(uid) for uid in org_user_ids]},
             )
         except Exception as exc:
             # Try to extract HTTP response details if available
             response_details = self._extract_http_error(exc)
-            raise Exception(f'Failed to restore user {org_user_id}: {exc}{response_details}') from exc
+            raise Exception(f'Failed to {action} {len(org_user_ids)} users: {exc}{response_details}') from exc
+        finally:
+            self.invalidate_users()
+        # Vaultwarden answers camelCase, older releases PascalCase
+        body = resp.json()
+        items = body.get("data", body.get("Data")) or []
+        errors = {}
+        for item in items:
+            error = item.get("error", item.get("Error"))
+            if not error:
+                continue
+            uid = item.get("id", item.get("Id"))
+            if not uid:
+                # The request itself went through; don't fail the whole batch.
+                logger.warning("Bulk %s reported an error for an unknown user: %s", action, error)
+                continue
+            errors[UUID(uid)] = error
+        return errors
 
     def _extract_http_error(self, exc: Exception) -> str:
         """Extract HTTP response details from various exception types."""
-        details = []
-        
-        if hasattr(exc, 'response') and exc.response is not None:
-            response = exc.response
-            details.append(f' [HTTP {response.status_code}]')
-            
-            # Try to extract response body safely
-            response_body = self._safe_read_response_body(response)
-            if response_body:
-                details.append(f' Response: {response_body}')
-        
+        # python-vaultwarden talks httpx; only status errors carry a response
+        if not isinstance(exc, httpx.HTTPStatusError):
+            return ''
+
+        response = exc.response
+        details = [f' [HTTP {response.status_code}]']
+
+        # Try to extract response body safely
+        response_body = self._safe_read_response_body(response)
+        if response_body:
+            details.append(f' Response: {response_body}')
+
         return ''.join(details)
     
     def _safe_read_response_body(self, response) -> str:
         """Extract response body content from httpx response.
-        
-        The python-vaultwarden library uses httpx internally. When errors occur,
-        the response may be in streaming mode. The key insight is that we need to
-        iterate over the stream to consume it before it gets closed.
+
+        python-vaultwarden's response hook reads the body before raising, so
+        ``read()`` normally just returns the buffered content; on a still-open
+        stream it consumes it.  Only a stream closed unread cannot be recovered.
         """
         try:
-            # Strategy 1: Check if stream is available and not consumed
-            if hasattr(response, 'stream') and not response.is_stream_consumed:
-                try:
-                    # Iterate the stream to get chunks before it's closed
-                    chunks = list(response.stream)
-                    if chunks:
-                        content_bytes = b''.join(chunks)
-                        content_text = content_bytes.decode('utf-8', errors='replace')
-                        return self._parse_error_from_text(content_text)
-                except Exception as err:
-                    logger.debug("Stream iteration failed: %s", err)
-
-            # Strategy 2: Try standard response.read() - works if stream=False
-            try:
-                content_bytes = response.read()
-                if content_bytes:
-                    content_text = content_bytes.decode('utf-8', errors='replace')
-                    return self._parse_error_from_text(content_text)
-            except Exception as err:
-                logger.debug("response.read() failed: %s", err)
-
-            # Strategy 3: Try response.content (may work if already read)
-            try:
-                content_bytes = response.content
-                if content_bytes:
-                    content_text = content_bytes.decode('utf-8', errors='replace')
-                    return self._parse_error_from_text(content_text)
-            except Exception as err:
-                logger.debug("response.content failed: %s", err)
-
-            # Strategy 4: Try response.text (may work if already read)
-            try:
-                text = response.text
-                if text:
-                    return self._parse_error_from_text(text)
-            except Exception as err:
-                logger.debug("response.text failed: %s", err)
-
-            # Strategy 5: Try JSON extraction (may work if content is accessible)
-            json_ct = response.headers.get("content-type", "").lower()
-            if "application/json" in json_ct:
-                try:
-                    return self._extract_json_error_message(response)
-                except Exception as err:
-                    logger.debug("JSON extraction failed: %s", err)
-
+            content_bytes = response.read()
+        except Exception as err:
+            logger.debug("Reading response body failed: %s", err)
             return "[Response body could not be accessed]"
-        except Exception as e:
-            logger.debug("Unhandled error in _safe_read_response_body: %s", e)
-            return f"[Error reading response body: {type(e).__name__}]"
-    
+        if not content_bytes:
+            return ""
+        return self._parse_error_from_text(content_bytes.decode('utf-8', errors='replace'))
+
     def _parse_error_from_text(self, content_text: str) -> str:
         """Parse error message from response text content."""
         try:
             # Try to parse as JSON first
             if content_text.strip().startswith('{'):
-                import json
                 json_data = json.loads(content_text)
                 return self._extract_message_from_json(json_data)
             else:
@@ -255,65 +385,39 @@ class VaultWardenClient:
                 json_str = str(json_data)
                 return json_str[:300] if len(json_str) <= 300 else json_str[:300] + '...'
         return str(json_data)[:300]
-    
-    def _extract_json_error_message(self, response) -> str:
-        """Extract meaningful error message from VaultWarden JSON response."""
-        try:
-            json_data = response.json()
-            return self._extract_message_from_json(json_data)
-        except (ValueError, TypeError, AttributeError):
-            # JSON parsing failed, try text
-            pass
-        
-        # Fall back to text content
-        try:
-            if hasattr(response, 'text'):
-                text_content = response.text
-                if text_content:
-                    return text_content[:500] if len(text_content) <= 500 else text_content[:500] + '...'
-        except Exception:
-            pass
-            
-        return '[Could not extract response content]'
 
 
 # ---------------------------------------------------------------------------
-# Helpers – TLS verification patch
+# Helpers
 # ---------------------------------------------------------------------------
 
-def _patch_httpx_no_verify() -> None:  # noqa: D401 – helper
-    """Monkey-patch **httpx** so all outgoing requests skip TLS verification.
-
-    The patch is applied only once per interpreter. It forces default
-    keyword ``verify=False`` on high-level convenience functions and on both
-    ``httpx.Client`` and ``httpx.AsyncClient`` constructors. This is enough
-    to cover all calls made by *python-vaultwarden*.
-    """
-    if getattr(httpx, "_vw_no_verify_patch", False):
-        return
-
-    orig_request = httpx.request
-
-    def _request(method, url, *args, **kwargs):  # type: ignore[override]
-        kwargs.setdefault("verify", False)
-        return orig_request(method, url, *args, **kwargs)
-
-    httpx.request = _request  # type: ignore[assignment]
+def _userid_map(users) -> Dict[UUID, str]:
+    """Map account ``UserId`` → e-mail (org users are keyed by org-user id)."""
+    return {uid: user.Email for user in users if (uid := getattr(user, "UserId", None))}
 
-    orig_client_init = httpx.Client.__init__
 
-    def _client_init(self, *a, **k):  # type: ignore[no-self-use]
-        k.setdefault("verify", False)
-        orig_client_init(self, *a, **k)  # type: ignore[misc]
-
-    httpx.Client.__init__ = _client_init  # type: ignore[assignment]
-
-    orig_async_init = httpx.AsyncClient.__init__
+@lru_cache(maxsize=1)
+def _parse_uuid(value: str) -> UUID | None:
+    """Parse *value* as a UUID, or ``None`` if it is not one (cached)."""
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
 
-    def _async_init(self, *a, **k):  # type: ignore[no-self-use]
-        k.setdefault("verify", False)
-        orig_async_init(self, *a, **k)  # type: ignore[misc]
 
-    httpx.AsyncClient.__init__ = _async_init  # type: ignore[assignment]
+def _unverified_copy(client: httpx.Client) -> httpx.Client:
+    """Rebuild *client* with TLS verification disabled and close the original.
 
-    httpx._vw_no_verify_patch = True  # type: ignore[attr-defined]
+    *python-vaultwarden* constructs its ``httpx.Client`` internally and keeps
+    it as ``BitwardenAPIClient._http_client`` (1.x, see requirements.txt); the
+    replacement keeps the base URL, response hooks, headers and timeout.
+    """
+    unverified = httpx.Client(
+        base_url=client.base_url,
+        event_hooks=client.event_hooks,
+        headers=client.headers,
+        timeout=client.timeout,
+        verify=False,
+    )
+    client.close()
+    return unverified
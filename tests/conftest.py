@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+INTEGRATION_DIR = Path(__file__).resolve().parent / "integration"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        default=False,
+        help="run tests that need the live 389ds / VaultWarden stack",
+    )
+
+
+def _is_integration(item) -> bool:
+    return INTEGRATION_DIR in Path(item.path).parents
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark everything under tests/integration and skip it unless opted in.
+
+    Integration items are also moved after the unit tests (stable sort), so
+    the fast suite reports first instead of waiting on the live stack.
+    """
+    run = config.getoption("--run-integration")
+    skip = pytest.mark.skip(reason="needs --run-integration")
+    for item in items:
+        if _is_integration(item):
+            item.add_marker(pytest.mark.integration)
+            if not run:
+                item.add_marker(skip)
+    items.sort(key=_is_integration)
@@ -0,0 +1,73 @@
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+import pytest
+from ldap3 import Connection
+
+from vaultwarden_ldap_sync.ldap_client import _build_server
+
+# ---------------------------------------------------------------------------
+# Load the project .env and defaults once so tests run outside docker compose
+# ---------------------------------------------------------------------------
+ROOT = Path(__file__).resolve().parents[2]
+DOTENV = ROOT / ".env"
+
+# Fallbacks for anything neither the environment nor .env sets (local 389ds)
+DEFAULT_ENV = {
+    "LDAP_HOST": "ldap://localhost:3389",
+    "LDAP_BIND_DN": "cn=Directory Manager",
+    "LDAP_BIND_PASSWORD": "adminpassword",
+    "LDAP_BASE_DN": "dc=domain,dc=local",
+}
+
+
+@lru_cache(maxsize=4)
+def _parse_dotenv(dotenv_path: str, mtime_ns: int) -> Dict[str, str]:
+    """Very small .env parser so we don't need extra deps.
+
+    *mtime_ns* is only part of the cache key, so an edited file is re-read.
+    """
+    env: Dict[str, str] = {}
+    for line in Path(dotenv_path).read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        k, v = line.split("=", 1)
+        env[k.strip()] = v.strip()
+    return env
+
+
+def _apply_dotenv(dotenv_path: Path = DOTENV) -> None:
+    """Copy .env values into ``os.environ`` without overriding set variables.
+
+    The file is always read: besides the connection variables the tests also
+    take TEST_VW_GROUP_DN(S), LDAP_PAGE_SIZE and VERBOSE_TESTS from it.
+    """
+    if not dotenv_path.exists():
+        return
+    env = _parse_dotenv(str(dotenv_path), dotenv_path.stat().st_mtime_ns)
+    os.environ.update({k: v for k, v in env.items() if k not in os.environ})
+
+
+_apply_dotenv()
+os.environ.update({k: v for k, v in DEFAULT_ENV.items() if k not in os.environ})
+
+
+@pytest.fixture(scope="session")
+def ldap_conn():
+    """One bound LDAP connection shared by every test in the session.
+
+    Built like :meth:`LdapClient._connection` (no schema read, same timeout)
+    so tests see the same attribute values as production.
+    """
+    conn = Connection(
+        _build_server(os.environ["LDAP_HOST"]),
+        user=os.environ["LDAP_BIND_DN"],
+        password=os.environ["LDAP_BIND_PASSWORD"],
+        auto_bind=True,
+        receive_timeout=5,
+    )
+    yield conn
+    conn.unbind()
@@ -1,6 +1,5 @@
 import os
-from pathlib import Path
-from typing import Dict, List
+from typing import List
 
 import pytest
 from ldap3 import Server, Connection, ALL
@@ -9,52 +8,16 @@ from ldap3 import Server, Connection, ALL
 from vaultwarden_ldap_sync.filter_builder import build_ldap_filter
 
 # ---------------------------------------------------------------------------
-# Helper to load .env so tests run even when executed outside docker compose
+# Connection variables (.env and local 389ds defaults are applied by conftest.py)
 # ---------------------------------------------------------------------------
 REQUIRED_VARS = ["LDAP_HOST", "LDAP_BIND_DN", "LDAP_BIND_PASSWORD", "LDAP_BASE_DN"]
 
-
-def _parse_dotenv(dotenv_path: Path) -> Dict[str, str]:
-    env: Dict[str, str] = {}
-    if dotenv_path.exists():
-        for line in dotenv_path.read_text().splitlines():
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            k, v = line.split("=", 1)
-            env[k.strip()] = v.strip()
-    return env
-
-
-ROOT = Path(__file__).resolve().parents[2]
-DOTENV = ROOT / ".env"
-if DOTENV.exists():
-    os.environ.update({k: v for k, v in _parse_dotenv(DOTENV).items() if k not in os.environ})
-
-LDAP_HOST = os.getenv("LDAP_HOST")
-LDAP_BIND_DN = os.getenv("LDAP_BIND_DN")
-LDAP_BIND_PASSWORD = os.getenv("LDAP_BIND_PASSWORD")
-LDAP_BASE_DN = os.getenv("LDAP_BASE_DN")
-
-
 # VaultWarden users group DN (single or comma-sep list)
 GROUP_DNS = os.getenv(
     "TEST_VW_GROUP_DNS",
     "cn=vaultwarden-users,cn=groups,cn=accounts,dc=domain,dc=local",
 )
 
-
-# ---------------------------------------------------------------------------
-# Provide sensible defaults if variables are still undefined (assume local 389ds)
-# ---------------------------------------------------------------------------
-_defaults = {
-    "LDAP_HOST": "ldap://localhost:3389",
-    "LDAP_BIND_DN": "cn=Directory Manager",
-    "LDAP_BIND_PASSWORD": "adminpassword",
-    "LDAP_BASE_DN": "dc=domain,dc=local",
-}
-for k, v in _defaults.items():
-    os.environ.setdefault(k, v)
-
 LDAP_HOST = os.environ["LDAP_HOST"]
 LDAP_BIND_DN = os.environ["LDAP_BIND_DN"]
 LDAP_BIND_PASSWORD = os.environ["LDAP_BIND_PASSWORD"]
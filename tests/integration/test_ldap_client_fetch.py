@@ -1,13 +1,11 @@
 import os
-from pathlib import Path
-from typing import Dict
-
-import pytest
+import re
 
+from vaultwarden_ldap_sync.config import DEFAULT_PAGE_SIZE
 from vaultwarden_ldap_sync.ldap_client import fetch_users
 
 # ---------------------------------------------------------------------------
-# Helpers for loading LDAP connection variables
+# LDAP connection variables
 # ---------------------------------------------------------------------------
 
 REQUIRED_VARS = [
@@ -18,109 +16,76 @@ REQUIRED_VARS = [
 ]
 
 
-def _parse_dotenv(dotenv_path: Path) -> Dict[str, str]:
-    """Very small .env parser so we don't need extra deps."""
-    env: Dict[str, str] = {}
-    if not dotenv_path.exists():
-        return env
-    for line in dotenv_path.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        k, v = line.split("=", 1)
-        env[k.strip()] = v.strip()
-    return env
-
-
-# Try to ensure env vars are set by reading project .env if needed
-ROOT = Path(__file__).resolve().parents[2]
-DOTENV = ROOT / ".env"
-if DOTENV.exists():
-    os.environ.update({k: v for k, v in _parse_dotenv(DOTENV).items() if k not in os.environ})
-
-# Collect values
-
+# Project .env values and local 389ds defaults are applied by conftest.py
 
-# ---------------------------------------------------------------------------
-# Provide sensible defaults if env vars are not set (local 389ds)
-# ---------------------------------------------------------------------------
-_defaults = {
-    "LDAP_HOST": "ldap://localhost:3389",
-    "LDAP_BIND_DN": "cn=Directory Manager",
-    "LDAP_BIND_PASSWORD": "adminpassword",
-    "LDAP_BASE_DN": "dc=domain,dc=local",
-}
-for k, v in _defaults.items():
-    os.environ.setdefault(k, v)
 
 # Test constants – adapt group DN if your environment differs
 GROUP_DN = os.getenv(
     "TEST_VW_GROUP_DN",
     "cn=vaultwarden-users,cn=groups,cn=accounts,dc=domain,dc=local",
 )
+# Exactly these users (by UID) are members of GROUP_DN in the test DIT
+EXPECTED_GROUP_UIDS = frozenset({"user", "user2", "user4"})
+EXPECTED_GROUP_UIDS_SORTED = tuple(sorted(EXPECTED_GROUP_UIDS))
 
 
 # ---------------------------------------------------------------------------
 # Tests
 # ---------------------------------------------------------------------------
 
-def _get_conn_kwargs():
+def _get_conn_kwargs(connection=None):
     return dict(
         host=os.environ["LDAP_HOST"],
         bind_dn=os.environ["LDAP_BIND_DN"],
         bind_password=os.environ["LDAP_BIND_PASSWORD"],
         base_dn=os.environ["LDAP_BASE_DN"],
+        page_size=int(os.getenv("LDAP_PAGE_SIZE", DEFAULT_PAGE_SIZE)),
+        connection=connection,
     )
 
 
+_UID_RE = re.compile(r"^uid=([^,]+)")
+
+
+def _uid(user):
+    """UID from the leading ``uid=`` RDN of the user's DN, or ``None``."""
+    m = _UID_RE.match(user.dn)
+    return m.group(1) if m else None
+
+
+def _by_uid(users):
+    """Index users by the ``uid=`` RDN of their DN."""
+    return {uid: u for u in users if (uid := _uid(u))}
+
+
 def test_group_filter_user_status():
+    # No shared connection: LdapClient opens (and unbinds) its own here.
     users = fetch_users(groups=GROUP_DN, **_get_conn_kwargs())
-    # Expect exactly 3 specific users (by UID) in the group
-    expected_uids = {"user", "user2", "user4"}
-    found_uids = set()
+    # One pass: index by DN uid, and collect UIDs (e-mail local part first)
+    found_uids, by_uid = set(), {}
     for u in users:
+        uid = _uid(u)
+        if uid:
+            by_uid[uid] = u
         if u.email and "@" in u.email:
             found_uids.add(u.email.split("@", 1)[0])
-        else:
+        elif uid:
             # fallback to UID parsed from DN: uid=foo,cn=users,...
-            dn_part = u.dn.split(",", 1)[0]
-            if dn_part.startswith("uid="):
-                found_uids.add(dn_part.removeprefix("uid="))
-    assert expected_uids.issubset(found_uids)
-    print("\nExpected vs Found UIDs (group filter):")
-    for uid in sorted(expected_uids):
-        print(f"  {uid}: {'present' if uid in found_uids else 'MISSING'}")
+            found_uids.add(uid)
+    assert EXPECTED_GROUP_UIDS.issubset(found_uids)
+    if os.getenv("VERBOSE_TESTS"):
+        print("\nExpected vs Found UIDs (group filter):")
+        for uid in EXPECTED_GROUP_UIDS_SORTED:
+            print(f"  {uid}: {'present' if uid in found_uids else 'MISSING'}")
     # user4 should be disabled while others active
-    status = {u.dn: u.disabled for u in users}
-    u4_dn = next(d for d in status if d.startswith("uid=user4"))
-    assert status[u4_dn] is True
-    for dn, disabled in status.items():
-        if dn != u4_dn:
-            assert disabled is False
+    assert by_uid["user4"].disabled is True
+    for uid, user in by_uid.items():
+        if uid != "user4":
+            assert user.disabled is False
 
 
-def test_all_users_include_user3():
-    users = fetch_users(**_get_conn_kwargs())
+def test_all_users_include_user3(ldap_conn):
+    users = fetch_users(**_get_conn_kwargs(ldap_conn))
     # Expect 4 users
     assert len(users) >= 4
-    assert any("uid=user3" in u.dn for u in users)
-
-
-def test_missing_attr_behaviour():
-    users = fetch_users(**_get_conn_kwargs())
-    # All users except user4 should report disabled False (missing attr)
-    for u in users:
-        if "uid=user4" in u.dn:
-            assert u.disabled is True
-        else:
-            assert u.disabled is False
-
-
-def test_missing_is_disabled_flag():
-    users = fetch_users(missing_is_disabled=True, **_get_conn_kwargs())
-    # Now users without attr *are* disabled (except user4 already disabled)
-    for u in users:
-        if "uid=user4" in u.dn:
-            assert u.disabled is True
-        else:
-            assert u.disabled is True  # others considered disabled due to flag
+    assert "user3" in _by_uid(users)
@@ -0,0 +1,92 @@
+from vaultwarden_ldap_sync.config import Config, get_config
+
+
+def test_defaults_do_not_read_environment(monkeypatch):
+    monkeypatch.setenv("LDAP_HOST", "ldap://env-host:389")
+    assert Config().ldap_host == "ldap://localhost:389"
+
+
+def test_from_env_reads_at_call_time(monkeypatch):
+    monkeypatch.setenv("LDAP_HOST", "ldaps://ldap.example.com")
+    monkeypatch.setenv("LDAP_USERS_ONLY", "1")
+    monkeypatch.setenv("VW_ORG_ID", "organization.2822e5d3-3a77-4ffb-bc78-d4ac6e6512b0")
+    cfg = Config.from_env()
+    assert cfg.ldap_host == "ldaps://ldap.example.com"
+    assert cfg.ldap_users_only is True
+    assert cfg.vw_org_id == "2822e5d3-3a77-4ffb-bc78-d4ac6e6512b0"
+
+
+def test_bool_values_are_case_insensitive(monkeypatch):
+    monkeypatch.setenv("LDAP_MISSING_IS_DISABLED", " True ")
+    monkeypatch.setenv("IGNORE_VW_CERT", "Yes")
+    monkeypatch.setenv("PREVENT_SELF_LOCK", "off")
+    cfg = Config.from_env()
+    assert cfg.ldap_missing_is_disabled is True
+    assert cfg.ignore_vw_cert is True
+    assert cfg.prevent_self_lock is False
+
+
+def test_get_config_is_cached(monkeypatch):
+    get_config.cache_clear()
+    monkeypatch.setenv("VW_URL", "https://vw.example.com")
+    cfg = get_config()
+    monkeypatch.setenv("VW_URL", "https://other.example.com")
+    assert get_config() is cfg
+    assert cfg.vw_url == "https://vw.example.com"
+    get_config.cache_clear()
+
+
+def test_org_id_prefix_stripped_once():
+    assert Config(vw_org_id="organization.abc").vw_org_id == "abc"
+    assert Config(vw_org_id="organization.a.b").vw_org_id == "a.b"
+    assert Config(vw_org_id="abc").vw_org_id == "abc"
+
+
+def test_disabled_values_list_parsing(monkeypatch):
+    monkeypatch.setenv("LDAP_DISABLED_VALUES", " locked, ,TRUE ,")
+    assert Config.from_env().ldap_disabled_values == ["locked", "TRUE"]
+
+
+def test_from_env_accepts_mapping(monkeypatch):
+    monkeypatch.setenv("LDAP_BASE_DN", "dc=process,dc=env")
+    cfg = Config.from_env({"LDAP_BASE_DN": "dc=example,dc=com", "LDAP_USERS_ONLY": "on"})
+    assert cfg.ldap_base_dn == "dc=example,dc=com"
+    assert cfg.ldap_users_only is True
+    assert cfg.ldap_host == "ldap://localhost:389"
+
+
+def test_debug_flag_parsed_once():
+    assert Config.from_env({"DEBUG": "true"}).debug is True
+    assert Config.from_env({"DEBUG": "0"}).debug is False
+    assert Config.from_env({}).debug is False
+
+
+def test_max_parallel_ops():
+    assert Config.from_env({}).max_parallel_ops == 8
+    assert Config.from_env({"MAX_PARALLEL_OPS": "2"}).max_parallel_ops == 2
+    assert Config.from_env({"MAX_PARALLEL_OPS": "0"}).max_parallel_ops == 1
+    assert Config.from_env({"MAX_PARALLEL_OPS": "-3"}).max_parallel_ops == 1
+
+
+def test_ldap_page_size():
+    assert Config.from_env({}).ldap_page_size == 500
+    assert Config.from_env({"LDAP_PAGE_SIZE": "2000"}).ldap_page_size == 2000
+    assert Config.from_env({"LDAP_PAGE_SIZE": "0"}).ldap_page_size == 1
+    assert Config.from_env({"LDAP_PAGE_SIZE": "-5"}).ldap_page_size == 1
+
+
+def test_masked_dict_hides_secrets():
+    masked = Config(ldap_bind_password="pw", vw_client_secret="s3cr3t", vw_url="https://vw").masked_dict()
+    assert masked["ldap_bind_password"] == "***"
+    assert masked["vw_client_secret"] == "***"
+    assert masked["vw_url"] == "https://vw"
+
+
+def test_sync_max_skips():
+    assert Config.from_env({}).sync_max_skips == 0
+    assert Config.from_env({"SYNC_MAX_SKIPS": "3"}).sync_max_skips == 3
+    assert Config.from_env({"SYNC_MAX_SKIPS": "-1"}).sync_max_skips == 0
+
+
+def test_from_env_falls_back_to_field_defaults():
+    assert Config.from_env({}) == Config()
@@ -3,27 +3,32 @@ import pytest
 from vaultwarden_ldap_sync.filter_builder import build_ldap_filter
 
 
+# (object_type, groups, additional_filter, expected)
+_FILTER_CASES: tuple[tuple[str | None, str | None, str | None, str], ...] = (
+    ("person", None, None, "(objectClass=person)"),
+    ("*", None, None, "(objectClass=*)"),  # wildcard => default
+    (None, "cn=test,dc=local", None, "(memberOf=cn=test,dc=local)"),
+    (
+        None,
+        "cn=g1,dc=local, cn=g2,dc=local",
+        None,
+        "(|(memberOf=cn=g1,dc=local)(memberOf=cn=g2,dc=local))",
+    ),
+    (
+        "person",
+        "cn=g1,dc=local",
+        "(uid=jdoe)",
+        "(&(objectClass=person)(memberOf=cn=g1,dc=local)(uid=jdoe))",
+    ),
+    # No clauses at all => default match all
+    (None, None, None, "(objectClass=*)"),
+)
+
+
 @pytest.mark.parametrize(
     "object_type,groups,additional,expected",
-    [
-        ("person", None, None, "(objectClass=person)"),
-        ("*", None, None, "(objectClass=*)"),  # wildcard => default
-        (None, "cn=test,dc=local", None, "(memberOf=cn=test,dc=local)"),
-        (
-            None,
-            "cn=g1,dc=local, cn=g2,dc=local",
-            None,
-            "(|(memberOf=cn=g1,dc=local)(memberOf=cn=g2,dc=local))",
-        ),
-        (
-            "person",
-            "cn=g1,dc=local",
-            "(uid=jdoe)",
-            "(&(objectClass=person)(memberOf=cn=g1,dc=local)(uid=jdoe))",
-        ),
-        # No clauses at all => default match all
-        (None, None, None, "(objectClass=*)"),
-    ],
+    _FILTER_CASES,
+    ids=[case[3] for case in _FILTER_CASES],
 )
 def test_build_filter(object_type, groups, additional, expected):
     assert build_ldap_filter(object_type, groups, additional) == expected
@@ -33,3 +38,27 @@ def test_invalid_group_attr():
     """Ensure custom group attribute is respected."""
     flt = build_ldap_filter(groups="cn=g,dc=local", group_attr="member")
     assert flt == "(member=cn=g,dc=local)"
+
+
+def test_group_delimiters():
+    """Semicolon and pipe split groups; DN-internal commas do not."""
+    flt = build_ldap_filter(groups="cn=g1,dc=local;cn=g2,dc=local|cn=g3,dc=local")
+    assert flt == "(|(memberOf=cn=g1,dc=local)(memberOf=cn=g2,dc=local)(memberOf=cn=g3,dc=local))"
+
+
+def test_filter_is_memoized():
+    build_ldap_filter.cache_clear()
+    first = build_ldap_filter("person", "cn=g,dc=local")
+    assert build_ldap_filter("person", "cn=g,dc=local") is first
+    assert build_ldap_filter.cache_info().hits == 1
+    assert build_ldap_filter.__wrapped__("person", "cn=g,dc=local") == first
+
+
+def test_additional_filter_wrapped_in_parentheses():
+    assert build_ldap_filter(additional_filter="uid=jdoe") == "(uid=jdoe)"
+    assert build_ldap_filter(additional_filter="(uid=jdoe)") == "(uid=jdoe)"
+
+
+def test_additional_filter_only_returned_verbatim():
+    assert build_ldap_filter("*", None, "(&(uid=a)(mail=*))") == "(&(uid=a)(mail=*))"
+    assert build_ldap_filter(None, "", " (uid=a) ") == "(uid=a)"
@@ -0,0 +1,34 @@
+"""Property-based checks for :func:`build_ldap_filter`."""
+import hypothesis
+from hypothesis import strategies as st
+
+from vaultwarden_ldap_sync.filter_builder import build_ldap_filter
+
+_object_types = st.one_of(st.none(), st.just("*"), st.from_regex(r"[a-zA-Z]+", fullmatch=True))
+_group_lists = st.lists(st.from_regex(r"cn=\w+,dc=\w+", fullmatch=True), min_size=1, max_size=5)
+_additional = st.one_of(st.none(), st.from_regex(r"\(\w+=\w+\)", fullmatch=True))
+
+
+def _balanced(flt: str) -> bool:
+    depth = 0
+    for ch in flt:
+        depth += {"(": 1, ")": -1}.get(ch, 0)
+        if depth < 0:
+            return False
+    return depth == 0
+
+
+@hypothesis.given(object_type=_object_types, groups=st.one_of(st.none(), _group_lists), additional=_additional)
+def test_filter_contains_every_component(object_type, groups, additional):
+    flt = build_ldap_filter.__wrapped__(object_type, ", ".join(groups) if groups else None, additional)
+
+    assert flt.startswith("(") and flt.endswith(")")
+    assert _balanced(flt)
+    if object_type and object_type != "*":
+        assert f"(objectClass={object_type})" in flt
+    for group in groups or ():
+        assert f"(memberOf={group})" in flt
+    if additional:
+        assert additional in flt
+    if not (object_type not in (None, "*") or groups or additional):
+        assert flt == "(objectClass=*)"
@@ -0,0 +1,151 @@
+from types import SimpleNamespace
+
+import pytest
+from ldap3 import MOCK_SYNC, Connection, Server
+
+from ldap3.core.exceptions import LDAPCommunicationError
+
+from vaultwarden_ldap_sync import ldap_client
+from vaultwarden_ldap_sync.ldap_client import LdapClient, fetch_users
+
+BASE_DN = "dc=domain,dc=local"
+BIND_DN = "cn=Directory Manager"
+
+
+def _mock_connection():
+    """In-memory DIT: user has no lock attribute, user4 is locked."""
+    conn = Connection(Server("mock"), user=BIND_DN, password="pw", client_strategy=MOCK_SYNC)
+    conn.strategy.add_entry(BIND_DN, {"userPassword": "pw", "objectClass": ["person"]})
+    conn.strategy.add_entry(f"uid=user,{BASE_DN}", {"objectClass": ["person"], "mail": "User@Domain.Local"})
+    conn.strategy.add_entry(
+        f"uid=user4,{BASE_DN}",
+        {"objectClass": ["person"], "mail": "user4@domain.local", "nsAccountLock": "TRUE"},
+    )
+    conn.bind()
+    return conn
+
+
+@pytest.fixture
+def mock_conn():
+    conn = _mock_connection()
+    yield conn
+    conn.unbind()
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Connections LdapClient opens itself, served from the in-memory DIT."""
+    conns = []
+
+    def connect(*_args, **_kwargs):
+        conns.append(_mock_connection())
+        return conns[-1]
+
+    monkeypatch.setattr(ldap_client, "Connection", connect)
+    return conns
+
+
+def _client(**kw):
+    return LdapClient(host="ldap://mock", bind_dn=BIND_DN, bind_password="pw", base_dn=BASE_DN, **kw)
+
+
+def _fail_first_fetch(client):
+    fetch = client._fetch
+    attempts = []
+
+    def flaky(conn):
+        attempts.append(conn)
+        if len(attempts) == 1:
+            raise LDAPCommunicationError("connection reset")
+        return fetch(conn)
+
+    client._fetch = flaky
+    return attempts
+
+
+def _fetch(conn, **kw):
+    users = fetch_users(
+        host="ldap://mock", bind_dn=BIND_DN, bind_password="pw", base_dn=BASE_DN, connection=conn, **kw
+    )
+    return {u.dn.split(",", 1)[0].removeprefix("uid="): u for u in users}
+
+
+def test_missing_attr_means_enabled(mock_conn):
+    users = _fetch(mock_conn)
+    assert users["user"].disabled is False
+    assert users["user4"].disabled is True
+
+
+def test_missing_is_disabled_flag(mock_conn):
+    users = _fetch(mock_conn, missing_is_disabled=True)
+    assert users["user"].disabled is True
+    assert users["user4"].disabled is True
+
+
+def test_disabled_values_are_configurable(mock_conn):
+    users = _fetch(mock_conn, disabled_values=("1",))
+    assert users["user4"].disabled is False
+
+
+def test_email_lower_cased_and_connection_left_bound(mock_conn):
+    assert _fetch(mock_conn)["user"].email == "user@domain.local"
+    assert mock_conn.bound
+
+
+def test_schema_decoded_values_are_compared_as_strings():
+    """A connection opened with schema info returns bool/int, not str."""
+    entries = [
+        {"type": "searchResEntry", "dn": f"uid=a,{BASE_DN}", "attributes": {"nsAccountLock": [True]}},
+        {"type": "searchResEntry", "dn": f"uid=b,{BASE_DN}", "attributes": {"nsAccountLock": 1}},
+    ]
+    search = SimpleNamespace(paged_search=lambda **_kw: iter(entries))
+    conn = SimpleNamespace(closed=False, extend=SimpleNamespace(standard=search))
+    users = _fetch(conn, disabled_values=("True", "1"))
+    assert users["a"].disabled is True
+    assert users["b"].disabled is True
+
+
+def test_reconnects_once_after_communication_error(opened):
+    client = _client()
+    attempts = _fail_first_fetch(client)
+    users = client.fetch()
+    assert len(users) == 2
+    assert len(opened) == 2
+    assert attempts == opened
+    assert opened[0].closed and opened[1].bound
+    client.close()
+    assert opened[1].closed
+
+
+def test_connection_reused_between_fetches(opened):
+    with _client() as client:
+        client.fetch()
+        client.fetch()
+    assert len(opened) == 1
+    assert opened[0].closed
+
+
+def test_supplied_connection_is_never_unbound(mock_conn, opened):
+    client = _client(connection=mock_conn)
+    _fail_first_fetch(client)
+    assert len(client.fetch()) == 2
+    client.close()
+    assert mock_conn.bound
+    # the replacement opened after the error belongs to the client
+    assert len(opened) == 1 and opened[0].closed
+
+
+def test_bytes_values_are_decoded():
+    entries = [
+        {
+            "type": "searchResEntry",
+            "dn": f"uid=c,{BASE_DN}",
+            "attributes": {"mail": [b"C@Domain.Local"], "memberOf": [b"cn=g,dc=x"], "nsAccountLock": [b"TRUE"]},
+        },
+    ]
+    search = SimpleNamespace(paged_search=lambda **_kw: iter(entries))
+    conn = SimpleNamespace(closed=False, extend=SimpleNamespace(standard=search))
+    user = _fetch(conn)["c"]
+    assert user.email == "c@domain.local"
+    assert user.groups == ["cn=g,dc=x"]
+    assert user.disabled is True
@@ -0,0 +1,91 @@
+import signal
+import threading
+import time
+
+import pytest
+
+from vaultwarden_ldap_sync import main as main_mod
+from vaultwarden_ldap_sync.config import Config
+
+
+class _StubLdap:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def fetch(self):
+        return []
+
+
+@pytest.fixture
+def loop(monkeypatch):
+    """main() with stub LDAP, no real SIGTERM handler and a recorded cycle count."""
+    monkeypatch.setattr(main_mod, "get_config", lambda: Config())
+    monkeypatch.setattr(main_mod.LdapClient, "from_config", classmethod(lambda cls, cfg: _StubLdap()))
+    monkeypatch.setattr(signal, "signal", lambda *_args: None)
+    monkeypatch.setenv("SYNC_INTERVAL", "3600")
+    monkeypatch.delenv("RUN_ONCE", raising=False)
+    main_mod._stop_event.clear()
+    cycles = []
+    monkeypatch.setattr(main_mod, "run_sync", lambda cfg, **kw: cycles.append(kw))
+    yield cycles
+    main_mod._stop_event.clear()
+
+
+def test_sigterm_during_wait_ends_loop_without_sleeping_interval(loop):
+    timer = threading.Timer(0.1, main_mod.shutdown, args=(signal.SIGTERM, None))
+    timer.start()
+    started = time.monotonic()
+    main_mod.main()
+    timer.join()
+    assert time.monotonic() - started < 5
+    assert len(loop) == 1
+
+
+def test_sigterm_during_cycle_finishes_that_cycle_only(loop, monkeypatch):
+    def cycle(cfg, **kw):
+        loop.append(kw)
+        main_mod.shutdown(signal.SIGTERM)
+
+    monkeypatch.setattr(main_mod, "run_sync", cycle)
+    started = time.monotonic()
+    main_mod.main()
+    assert time.monotonic() - started < 5
+    assert len(loop) == 1
+
+
+class _StubVW:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_vw_client_reused_and_recreated_after_failure(loop, monkeypatch):
+    created = []
+
+    def from_config(cls, cfg):
+        created.append(_StubVW())
+        return created[-1]
+
+    used = []
+
+    def cycle(cfg, *, vw_factory, **kw):
+        used.append(vw_factory(cfg))
+        if len(used) == 1:
+            raise RuntimeError("vw error")
+        if len(used) == 3:
+            main_mod.shutdown()
+
+    monkeypatch.setattr(main_mod.VaultWardenClient, "from_config", classmethod(from_config))
+    monkeypatch.setattr(main_mod, "run_sync", cycle)
+    monkeypatch.setenv("SYNC_INTERVAL", "0")
+    main_mod.main()
+    # failed cycle: its client is closed; the next cycle gets a new one that
+    # is then reused and closed on exit
+    assert len(created) == 2
+    assert used == [created[0], created[1], created[1]]
+    assert created[0].closed and created[1].closed
@@ -0,0 +1,196 @@
+from uuid import uuid4
+
+import pytest
+
+from vaultwarden_ldap_sync.config import Config
+from vaultwarden_ldap_sync.ldap_client import LdapUser
+from vaultwarden_ldap_sync.sync_engine import SyncState, _calculate_actions, run_sync
+from vaultwarden_ldap_sync.vw_client import OrgUser
+
+CFG = Config(prevent_self_lock=False)
+
+
+def _ldap(email, disabled=False):
+    return LdapUser(dn=f"uid={email.split('@')[0]},dc=example", email=email, groups=[], disabled=disabled)
+
+
+class FakeVW:
+    """Records calls; membership is a plain e-mail → status mapping."""
+
+    def __init__(self, statuses=None, bulk=False):
+        self.users = {e: OrgUser(uuid4(), e, s) for e, s in (statuses or {}).items()}
+        self.bulk = bulk
+        self.fetches = 0
+        self.calls = []
+
+    def user_map(self, force=False):
+        self.fetches += 1
+        return dict(self.users)
+
+    def our_email(self, _uuid):
+        return None
+
+    def invite_many(self, emails):
+        self.calls.append(("invite_many", tuple(sorted(emails))))
+
+    def revoke(self, uid):
+        self.calls.append(("revoke", uid))
+
+    def restore(self, uid):
+        self.calls.append(("restore", uid))
+
+    def supports_bulk(self):
+        return self.bulk
+
+    def revoke_many(self, ids):
+        self.calls.append(("revoke_many", tuple(ids)))
+        return {}
+
+    def restore_many(self, ids):
+        self.calls.append(("restore_many", tuple(ids)))
+        return {}
+
+
+# (ldap entries as (email, disabled), vw statuses, whitelist, ldap_users_only,
+#  expected (invite, revoke, restore))
+_ACTION_CASES = (
+    # enabled in LDAP: invite only when absent from VW in any status
+    ([("a@x", False)], {}, (), False, ({"a@x"}, set(), set())),
+    ([("a@x", False)], {"a@x": 0}, (), False, (set(), set(), set())),
+    ([("a@x", False)], {"a@x": 1}, (), False, (set(), set(), set())),
+    ([("a@x", False)], {"a@x": 2}, (), False, (set(), set(), set())),
+    ([("a@x", False)], {"a@x": -1}, (), False, (set(), set(), {"a@x"})),
+    # disabled in LDAP: revoke invited/confirmed, leave accepted/revoked
+    ([("a@x", True)], {}, (), False, (set(), set(), set())),
+    ([("a@x", True)], {"a@x": 0}, (), False, (set(), {"a@x"}, set())),
+    ([("a@x", True)], {"a@x": 1}, (), False, (set(), set(), set())),
+    ([("a@x", True)], {"a@x": 2}, (), False, (set(), {"a@x"}, set())),
+    ([("a@x", True)], {"a@x": -1}, (), False, (set(), set(), set())),
+    # the whitelist is never revoked or invited, but may be restored
+    ([("a@x", True)], {"a@x": 2}, ("a@x",), False, (set(), set(), set())),
+    ([("a@x", False)], {}, ("a@x",), False, (set(), set(), set())),
+    ([("a@x", False)], {"a@x": -1}, ("a@x",), False, (set(), set(), {"a@x"})),
+    # ldap_users_only: active VW members unknown to LDAP are revoked
+    ([], {"a@x": 0, "b@x": 1, "c@x": 2, "d@x": -1}, (), False, (set(), set(), set())),
+    ([], {"a@x": 0, "b@x": 1, "c@x": 2, "d@x": -1}, (), True, (set(), {"a@x", "c@x"}, set())),
+    ([("a@x", False)], {"a@x": 2, "b@x": 2}, ("b@x",), True, (set(), set(), set())),
+    ([("a@x", True)], {"a@x": 2}, (), True, (set(), {"a@x"}, set())),
+    # the same e-mail in both buckets: disabled wins for active members,
+    # enabled wins for revoked ones and for invites
+    ([("a@x", False), ("a@x", True)], {"a@x": 2}, (), False, (set(), {"a@x"}, set())),
+    ([("a@x", False), ("a@x", True)], {"a@x": 2}, (), True, (set(), {"a@x"}, set())),
+    ([("a@x", False), ("a@x", True)], {"a@x": -1}, (), False, (set(), set(), {"a@x"})),
+    ([("a@x", False), ("a@x", True)], {}, (), False, ({"a@x"}, set(), set())),
+    # entries without an e-mail are ignored
+    ([(None, False), (None, True)], {"a@x": 2}, (), False, (set(), set(), set())),
+)
+
+
+@pytest.mark.parametrize("ldap, statuses, whitelist, only, expected", _ACTION_CASES)
+def test_calculate_actions(ldap, statuses, whitelist, only, expected):
+    actions = _calculate_actions(
+        ldap_users=[LdapUser(dn="", email=e, groups=[], disabled=d) for e, d in ldap],
+        vw_users=FakeVW(statuses).users,
+        whitelist=frozenset(whitelist),
+        ldap_users_only=only,
+    )
+    assert (actions.invite, actions.revoke, actions.restore) == expected
+
+
+def _sync(vw, ldap_users, state=None, cfg=CFG):
+    return run_sync(cfg, fetcher=lambda _cfg: ldap_users, vw_factory=lambda _cfg: vw, state=state)
+
+
+def test_state_skips_only_after_idle_cycle():
+    state = SyncState(max_skips=2)
+    snap = frozenset({("a@x", False)})
+    assert not state.may_skip
+    assert not state.should_skip(snap)
+
+    state.record(snap, idle=False)
+    assert not state.may_skip
+
+    state.record(snap, idle=True)
+    assert state.may_skip
+    assert not state.should_skip(frozenset())
+    assert state.should_skip(snap)
+    assert state.should_skip(snap)
+    assert not state.may_skip
+    assert not state.should_skip(snap)
+
+
+def test_zero_max_skips_never_skips():
+    state = SyncState(max_skips=0)
+    state.record(frozenset(), idle=True)
+    assert not state.may_skip
+
+
+def test_idle_cycles_skip_vw_fetch_then_refetch():
+    vw = FakeVW({"a@x": 2})
+    users = [_ldap("a@x")]
+    state = SyncState(max_skips=2)
+    for _ in range(7):
+        assert not _sync(vw, users, state).any()
+    # fetch, skip, skip, fetch, skip, skip, fetch
+    assert vw.fetches == 3
+
+
+def test_ldap_change_forces_vw_fetch():
+    vw = FakeVW({"a@x": 2})
+    state = SyncState()
+    _sync(vw, [_ldap("a@x")], state)
+    actions = _sync(vw, [_ldap("a@x"), _ldap("b@x")], state)
+    assert actions.invite == {"b@x"}
+    assert vw.fetches == 2
+    assert vw.calls == [("invite_many", ("b@x",))]
+
+
+def test_busy_cycle_is_not_skipped():
+    vw = FakeVW({"a@x": 2})
+    users = [_ldap("a@x", disabled=True)]
+    state = SyncState()
+    assert _sync(vw, users, state).revoke == {"a@x"}
+    # VW still reports a@x active, so the next cycle must compare again.
+    assert _sync(vw, users, state).revoke == {"a@x"}
+    assert vw.fetches == 2
+
+
+def test_failed_actions_raise_after_all_ops():
+    class Failing(FakeVW):
+        def invite_many(self, emails):
+            super().invite_many(emails)
+            raise ValueError("boom")
+
+        def revoke(self, uid):
+            super().revoke(uid)
+            raise ValueError("gone")
+
+    vw = Failing({"a@x": 2, "d@x": 2})
+    users = [_ldap("a@x", disabled=True), _ldap("b@x"), _ldap("c@x"), _ldap("d@x", disabled=True)]
+    with pytest.raises(RuntimeError) as exc_info:
+        _sync(vw, users)
+    for err in ("invite b@x: boom", "invite c@x: boom", "revoke a@x: gone", "revoke d@x: gone"):
+        assert err in str(exc_info.value)
+    assert vw.calls[0] == ("invite_many", ("b@x", "c@x"))
+    assert sorted(vw.calls[1:]) == sorted(("revoke", vw.users[e].id) for e in ("a@x", "d@x"))
+
+
+def test_invites_sent_as_one_request_and_bulk_revoke_restore():
+    vw = FakeVW({"a@x": 2, "r@x": -1}, bulk=True)
+    users = [_ldap("a@x", disabled=True), _ldap("b@x"), _ldap("c@x"), _ldap("r@x")]
+    _sync(vw, users)
+    assert vw.calls == [
+        ("invite_many", ("b@x", "c@x")),
+        ("revoke_many", (vw.users["a@x"].id,)),
+        ("restore_many", (vw.users["r@x"].id,)),
+    ]
+
+
+def test_vw_failure_not_swallowed_when_ldap_is_empty():
+    def broken_factory(_cfg):
+        raise ConnectionError("vw down")
+
+    state = SyncState()
+    with pytest.raises(ConnectionError, match="vw down"):
+        run_sync(CFG, fetcher=lambda _cfg: [], vw_factory=broken_factory, state=state)
+    assert not state.may_skip
@@ -0,0 +1,182 @@
+import ssl
+import threading
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import httpx
+import pytest
+from vaultwarden.utils.logger import log_raise_for_status
+
+from vaultwarden_ldap_sync.config import Config
+from vaultwarden_ldap_sync.ldap_client import LdapUser
+from vaultwarden_ldap_sync.sync_engine import run_sync
+from vaultwarden_ldap_sync.vw_client import VaultWardenClient, _unverified_copy
+
+ORG_ID = "2822e5d3-3a77-4ffb-bc78-d4ac6e6512b0"
+
+
+def _response(status, body=None):
+    return httpx.Response(status, json=body, request=httpx.Request("PUT", "http://vw.invalid"))
+
+
+def _client(*responses, members=()):
+    """VaultWardenClient without network access; api_request answers *responses* in order."""
+    calls = []
+    answers = iter(responses)
+
+    def api_request(method, path, **kwargs):
+        calls.append((method, path, kwargs))
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        log_raise_for_status(answer)  # python-vaultwarden's response hook
+        return answer
+
+    client = object.__new__(VaultWardenClient)
+    client._bw = SimpleNamespace(api_request=api_request, connect_token=None)
+    client._org = SimpleNamespace(Id=ORG_ID, users=lambda force_refresh=False: list(members))
+    client._userid_to_email = None
+    client._users_stale = False
+    client._bulk_supported = None
+    client._token_lock = threading.Lock()
+    return client, calls
+
+
+@pytest.mark.parametrize("id_key, error_key, data_key", [("id", "error", "data"), ("Id", "Error", "Data")])
+def test_bulk_errors_parsed_in_either_case(id_key, error_key, data_key):
+    ok, bad = uuid4(), uuid4()
+    body = {data_key: [{id_key: str(ok), error_key: ""}, {id_key: str(bad), error_key: "owner"}]}
+    client, calls = _client(_response(200, body))
+    assert client.revoke_many([ok, bad]) == {bad: "owner"}
+    method, path, kwargs = calls[0]
+    assert (method, path) == ("PUT", f"/api/organizations/{ORG_ID}/users/revoke")
+    assert kwargs["json"] == {"ids": [str(ok), str(bad)]}
+    assert client._users_stale
+
+
+def test_bulk_error_without_id_does_not_fail_the_batch(caplog):
+    bad = uuid4()
+    body = {"data": [{"error": "mystery"}, {"id": str(bad), "error": "owner"}]}
+    client, _calls = _client(_response(200, body))
+    assert client.revoke_many([bad, uuid4()]) == {bad: "owner"}
+    assert "mystery" in caplog.text
+
+
+def test_invite_many_posts_all_emails_at_once():
+    client, calls = _client(_response(200))
+    client.invite_many(["a@x", "b@x"])
+    method, path, kwargs = calls[0]
+    assert (method, path) == ("POST", f"/api/organizations/{ORG_ID}/users/invite")
+    assert kwargs["json"]["emails"] == ["a@x", "b@x"]
+    assert kwargs["json"]["type"] == 2
+    assert client._users_stale
+
+
+def test_invite_many_failure_names_the_batch():
+    client, _calls = _client(_response(400, {"message": "User already in organization"}))
+    with pytest.raises(Exception, match=r"(?s)Failed to invite 2 users: .*User already in organization"):
+        client.invite_many(["a@x", "b@x"])
+
+
+def test_restore_many_without_errors():
+    client, calls = _client(_response(200, {"data": []}))
+    assert client.restore_many([uuid4()]) == {}
+    assert calls[0][1].endswith("/users/restore")
+
+
+@pytest.mark.parametrize("status", [404, 405])
+def test_probe_missing_endpoint_is_cached(status, caplog):
+    client, calls = _client(_response(status))
+    assert client.supports_bulk() is False
+    assert client.supports_bulk() is False
+    assert len(calls) == 1
+    assert not [r for r in caplog.records if r.levelname == "ERROR"]
+
+
+def test_probe_filter_is_limited_to_the_probe(caplog):
+    client, _calls = _client(_response(500))
+    assert client.supports_bulk() is False
+    # an unexpected status during the probe is still logged...
+    assert "Error: 500" in caplog.text
+    caplog.clear()
+
+    # ...and so is a 404 outside of it, e.g. from another request or thread
+    def other_request():
+        with pytest.raises(httpx.HTTPStatusError):
+            log_raise_for_status(_response(404))
+
+    worker = threading.Thread(target=other_request)
+    worker.start()
+    worker.join()
+    assert "Error: 404" in caplog.text
+
+
+def test_probe_success_is_cached():
+    client, calls = _client(_response(200, {"data": []}))
+    assert client.supports_bulk() is True
+    assert client.supports_bulk() is True
+    assert calls[0][2]["json"] == {"ids": []}
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("failure", [_response(500), httpx.ConnectError("refused")])
+def test_probe_failure_means_unsupported_for_now(failure):
+    client, calls = _client(failure, _response(200, {"data": []}))
+    assert client.supports_bulk() is False
+    assert client.supports_bulk() is True
+    assert len(calls) == 2
+
+
+def test_engine_falls_back_to_per_user_calls_when_probe_fails():
+    uid = uuid4()
+    member = SimpleNamespace(Id=uid, Email="a@x", Status=2)
+    client, calls = _client(httpx.ConnectError("refused"), _response(200), members=[member])
+    users = [LdapUser(dn="uid=a", email="a@x", groups=[], disabled=True)]
+    actions = run_sync(
+        Config(prevent_self_lock=False), fetcher=lambda _cfg: users, vw_factory=lambda _cfg: client
+    )
+    assert actions.revoke == {"a@x"}
+    assert [path for _m, path, _kw in calls] == [
+        f"/api/organizations/{ORG_ID}/users/revoke",
+        f"/api/organizations/{ORG_ID}/users/{uid}/revoke",
+    ]
+
+
+def test_expiring_token_renewed_once_across_worker_threads():
+    client, _calls = _client(*[_response(200)] * 8)
+    stale = SimpleNamespace(is_expired=lambda now=None: True)
+    fresh = SimpleNamespace(is_expired=lambda now=None: False)
+    refreshes = []
+
+    def refresh():
+        time.sleep(0.05)  # widen the window for a racing second refresh
+        refreshes.append(1)
+        client._bw.connect_token = fresh
+
+    client._bw.connect_token = stale
+    client._bw._refresh_connect_token = refresh
+    threads = [threading.Thread(target=client.revoke, args=(uuid4(),)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(refreshes) == 1
+
+
+def test_unverified_copy_keeps_settings_and_disables_verification():
+    original = httpx.Client(
+        base_url="https://vw.example/",
+        headers={"Bitwarden-Client-Version": "2024.1.0"},
+        timeout=7,
+        event_hooks={"response": [log_raise_for_status]},
+    )
+    copy = _unverified_copy(original)
+    assert original.is_closed
+    assert copy.base_url == original.base_url
+    assert copy.headers["Bitwarden-Client-Version"] == "2024.1.0"
+    assert copy.event_hooks["response"] == [log_raise_for_status]
+    assert copy.timeout == httpx.Timeout(7)
+    # httpx exposes verification only through the transport's SSL context
+    assert copy._transport._pool._ssl_context.verify_mode == ssl.CERT_NONE
+    copy.close()